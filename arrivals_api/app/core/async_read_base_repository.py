@@ -0,0 +1,194 @@
+import logging
+from typing import AsyncIterator, Generic, List, Optional, Type, TypeVar, Union
+
+from pydantic import BaseModel
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+
+from app.core.read_base_repository import list_adapter
+from app.core.read_db import (
+    ReadDBUnavailable,
+    async_mongodb,
+    connection_lost,
+    read_breaker,
+)
+from app.core.read_indexes import register_indexes
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class AsyncReadRepository(Generic[T]):
+    """
+    Async counterpart of ``ReadRepository``. Every query is awaited on the
+    client connected by the lifespan, so a worker can serve many read
+    queries at once; cursors are consumed with ``async for``.
+    """
+
+    # Declarative indexes, created at startup for ``collection_name``
+    collection_name: Optional[str] = None
+    indexes: List[IndexModel] = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.collection_name and cls.indexes:
+            register_indexes(cls.collection_name, cls.indexes)
+
+    def __init__(self, collection_name: str, model: Type[T]):
+        self.collection = (
+            async_mongodb.database[collection_name]
+            if async_mongodb.database is not None
+            else None
+        )
+        self.model = model
+        # Only fetch what the model exposes
+        self.projection = {"_id": 0, **dict.fromkeys(model.model_fields, 1)}
+        self._list_adapter = list_adapter(model)
+
+    @property
+    def available(self) -> bool:
+        """
+        Whether reads can be sent to the read DB right now. When it is
+        down they raise ``ReadDBUnavailable`` without waiting for it.
+        """
+        return self.collection is not None and read_breaker.allow()
+
+    def _check(self) -> None:
+        if not self.available:
+            raise ReadDBUnavailable()
+
+    async def get_by_id(self, id: Union[int, str]) -> Optional[T]:
+        document = await self.get_raw_by_id(id)
+        return self.model.model_validate(document) if document else None
+
+    async def get_raw_by_id(self, id: Union[int, str]) -> Optional[dict]:
+        self._check()
+        try:
+            return await self.collection.find_one({"_id": id}, self.projection)
+        except PyMongoError as e:
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
+            logger.error("Error retrieving document by ID: %s", e)
+            return None
+
+    async def find_one(self, query: dict) -> Optional[T]:
+        self._check()
+        try:
+            document = await self.collection.find_one(query, self.projection)
+        except PyMongoError as e:
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
+            logger.error("Error retrieving document: %s", e)
+            return None
+        return self.model.model_validate(document) if document else None
+
+    async def get_all(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        query: Optional[dict] = None,
+    ) -> List[T]:
+        """
+        Retrieve documents ordered by ID, optionally as a keyset page that
+        starts right after ``after_id``.
+        """
+        return self._list_adapter.validate_python(
+            await self.get_all_raw(after_id, limit, query)
+        )
+
+    async def get_all_raw(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        query: Optional[dict] = None,
+    ) -> List[dict]:
+        self._check()
+        try:
+            cursor = self._keyset_cursor(after_id, query).limit(limit or 0)
+            return await cursor.to_list(None)
+        except PyMongoError as e:
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
+            logger.error("Error retrieving all documents: %s", e)
+            return []
+
+    async def find(
+        self,
+        query: Optional[dict] = None,
+        sort: Optional[list] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[T]:
+        """
+        Yield the documents matching ``query`` as models, ``batch_size``
+        per round trip.
+        """
+        async for document in self.find_raw(query, sort, batch_size):
+            yield self.model.model_validate(document)
+
+    async def find_raw(
+        self,
+        query: Optional[dict] = None,
+        sort: Optional[list] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[dict]:
+        self._check()
+        try:
+            cursor = self.collection.find(query or {}, self.projection)
+            if sort:
+                cursor = cursor.sort(sort)
+            async for document in cursor.batch_size(batch_size):
+                yield document
+        except PyMongoError as e:
+            # Rows may have been sent already: abort the response rather
+            # than end it as if it were complete
+            logger.error("Error finding documents: %s", e)
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
+            raise
+
+    async def stream(
+        self,
+        after_id: Optional[int] = None,
+        batch_size: int = 1000,
+        query: Optional[dict] = None,
+    ) -> AsyncIterator[T]:
+        """
+        Yield every document after ``after_id`` in ID order, fetching
+        ``batch_size`` documents per round trip.
+        """
+        self._check()
+        try:
+            cursor = self._keyset_cursor(after_id, query)
+            async for document in cursor.batch_size(batch_size):
+                yield self.model.model_validate(document)
+        except PyMongoError as e:
+            logger.error("Error streaming documents: %s", e)
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
+            raise
+
+    async def aggregate(
+        self, pipeline: List[dict], **kwargs
+    ) -> AsyncIterator[dict]:
+        """
+        Run an aggregation pipeline and yield its raw result documents.
+        """
+        self._check()
+        try:
+            cursor = await self.collection.aggregate(pipeline, **kwargs)
+            async for document in cursor:
+                yield document
+        except PyMongoError as e:
+            logger.error("Error running aggregation: %s", e)
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
+            raise
+
+    def _keyset_cursor(
+        self, after_id: Optional[int], query: Optional[dict] = None
+    ):
+        query = dict(query or {})
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
+        return self.collection.find(query, self.projection).sort("_id", 1)
@@ -0,0 +1,300 @@
+from typing import (
+    AsyncIterator,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.sql import ColumnElement
+
+from app.core.etag import collection_versions
+from app.core.outbox import (
+    DELETE,
+    UPSERT,
+    OutboxEvent,
+    event_rows,
+    record_event,
+)
+from app.core.projector import projector
+from app.core.write_base_repository import parse_integrity_error
+from app.core.write_db import AsyncSessionLocal
+
+T = TypeVar("T")
+
+
+class AsyncBaseRepository(Generic[T]):
+    """
+    Async counterpart of ``BaseRepository``. Every database round trip is
+    awaited, so the event loop keeps serving other requests meanwhile.
+    """
+
+    # Read-model aggregate name; when set, writes are recorded in the outbox
+    aggregate: Optional[str] = None
+    # Collections whose representations embed this aggregate's rows; their
+    # ETag versions are bumped along with its own
+    embedded_in: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        model: Type[T],
+        db: AsyncSession,
+        loader_options: Sequence[LoaderOption] = (),
+    ):
+        self.model = model
+        self.db = db
+        # Relationship loading strategy (selectinload, joinedload...) used
+        # by every read unless a call passes its own ``options``
+        self.loader_options = tuple(loader_options)
+
+    async def get(
+        self, id: int, options: Optional[Sequence[LoaderOption]] = None
+    ) -> Optional[T]:
+        return await self.db.get(
+            self.model, id, options=self._options(options)
+        )
+
+    async def get_all(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        options: Optional[Sequence[LoaderOption]] = None,
+        criteria: Sequence[ColumnElement[bool]] = (),
+    ) -> List[T]:
+        """
+        Retrieve rows ordered by id, optionally as a keyset page that starts
+        right after ``after_id``. Only rows matching every ``criteria``
+        clause are returned.
+        """
+        result = await self.db.scalars(
+            self._keyset_query(after_id, options, criteria).limit(limit)
+        )
+        return list(result.unique().all())
+
+    async def stream(
+        self,
+        after_id: Optional[int] = None,
+        batch_size: int = 1000,
+        options: Optional[Sequence[LoaderOption]] = None,
+        criteria: Sequence[ColumnElement[bool]] = (),
+    ) -> AsyncIterator[T]:
+        """
+        Yield every row through a server-side cursor, ``batch_size`` rows at
+        a time. The stream owns its session so it can outlive the request
+        scoped one while the response is being sent.
+        """
+        async with AsyncSessionLocal() as db:
+            result = await db.stream_scalars(
+                self._keyset_query(
+                    after_id, options, criteria
+                ).execution_options(yield_per=batch_size)
+            )
+            async for obj in result:
+                yield obj
+
+    async def create(self, obj: T) -> T:
+        try:
+            self.db.add(obj)
+            await self.db.flush()
+            await self._record(obj.id, UPSERT)
+            await self.db.commit()
+            self._notify()
+            return await self._reload(obj)
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise ValueError(parse_integrity_error(e))
+
+    async def update(self, obj: T, data: dict) -> T:
+        try:
+            for field, value in data.items():
+                setattr(obj, field, value)
+            await self._record(obj.id, UPSERT)
+            await self.db.commit()
+            self._notify()
+            return await self._reload(obj)
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise ValueError(parse_integrity_error(e))
+
+    async def delete(self, id: int) -> None:
+        await self.delete_by_id(id)
+
+    async def update_by_id(self, id: int, changes: dict) -> Optional[T]:
+        """
+        Write ``changes`` to row ``id`` with a single UPDATE ... RETURNING,
+        touching only the given columns. Returns the updated row, without
+        relationships, or ``None`` when there is no such row.
+        """
+        if not changes:
+            return await self.get(id, options=())
+        try:
+            obj = await self.db.scalar(
+                update(self.model)
+                .where(self.model.id == id)
+                .values(**changes)
+                .returning(self.model)
+                .execution_options(populate_existing=True)
+            )
+            if obj is None:
+                await self.db.rollback()
+                return None
+            await self._record(id, UPSERT)
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise ValueError(parse_integrity_error(e))
+        self._notify()
+        return obj
+
+    async def delete_by_id(self, id: int) -> bool:
+        """
+        Delete row ``id`` with a single DELETE. Returns whether it existed.
+        """
+        try:
+            result = await self.db.execute(
+                delete(self.model).where(self.model.id == id)
+            )
+            if not result.rowcount:
+                await self.db.rollback()
+                return False
+            await self._record(id, DELETE)
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise ValueError(parse_integrity_error(e))
+        self._notify()
+        return True
+
+    async def create_many(self, rows: List[dict]) -> List[int]:
+        """
+        Insert ``rows`` with one multi-row INSERT in a single transaction.
+        Returns the new ids in the order of ``rows``.
+        """
+        if not rows:
+            return []
+        try:
+            ids = list(
+                await self.db.scalars(
+                    insert(self.model).returning(
+                        self.model.id, sort_by_parameter_order=True
+                    ),
+                    rows,
+                )
+            )
+            await self._record_many(ids, UPSERT)
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise ValueError(parse_integrity_error(e))
+        self._notify(len(ids))
+        return ids
+
+    async def update_many(self, rows: List[dict]) -> List[int]:
+        """
+        Apply partial updates, each keyed by its ``id``, as a bulk UPDATE by
+        primary key in a single transaction. Rows whose id does not exist
+        are skipped; returns the ids that were updated.
+        """
+        existing = await self._existing_ids([row["id"] for row in rows])
+        rows = [row for row in rows if row["id"] in existing]
+        if not rows:
+            return []
+        try:
+            await self.db.execute(update(self.model), rows)
+            ids = list(dict.fromkeys(row["id"] for row in rows))
+            await self._record_many(ids, UPSERT)
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise ValueError(parse_integrity_error(e))
+        self._notify(len(ids))
+        return ids
+
+    async def delete_many(self, ids: List[int]) -> List[int]:
+        """
+        Delete every row in ``ids`` with one statement. Returns the ids that
+        existed.
+        """
+        if not ids:
+            return []
+        try:
+            deleted = list(
+                await self.db.scalars(
+                    delete(self.model)
+                    .where(self.model.id.in_(set(ids)))
+                    .returning(self.model.id)
+                )
+            )
+            await self._record_many(deleted, DELETE)
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise ValueError(parse_integrity_error(e))
+        self._notify(len(deleted))
+        return deleted
+
+    async def _record(self, id: int, operation: str) -> None:
+        if self.aggregate:
+            record_event(self.db, self.aggregate, id, operation)
+            await self._bump_versions()
+
+    async def _record_many(self, ids: List[int], operation: str) -> None:
+        if self.aggregate and ids:
+            await self.db.execute(
+                insert(OutboxEvent),
+                event_rows(self.aggregate, ids, operation),
+            )
+            await self._bump_versions()
+
+    async def _bump_versions(self) -> None:
+        await self.db.execute(
+            collection_versions.bump(self.aggregate, *self.embedded_in)
+        )
+
+    def _notify(self, events: int = 1) -> None:
+        if self.aggregate and events:
+            projector.notify(events)
+
+    async def _existing_ids(self, ids: List[int]) -> set:
+        if not ids:
+            return set()
+        result = await self.db.scalars(
+            select(self.model.id).where(self.model.id.in_(set(ids)))
+        )
+        return set(result)
+
+    def _options(
+        self, options: Optional[Sequence[LoaderOption]]
+    ) -> Sequence[LoaderOption]:
+        return self.loader_options if options is None else tuple(options)
+
+    async def _reload(self, obj: T) -> T:
+        # Re-read through the loader options so relationships are loaded
+        return await self.db.get(
+            self.model,
+            obj.id,
+            options=self.loader_options,
+            populate_existing=True,
+        )
+
+    def _keyset_query(
+        self,
+        after_id: Optional[int],
+        options: Optional[Sequence[LoaderOption]] = None,
+        criteria: Sequence[ColumnElement[bool]] = (),
+    ):
+        query = (
+            select(self.model)
+            .options(*self._options(options))
+            .where(*criteria)
+        )
+        if after_id is not None:
+            query = query.where(self.model.id > after_id)
+        return query.order_by(self.model.id)
@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+CLOSED = "closed"
+OPEN = "open"
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a dependency that keeps failing. It opens after
+    ``failure_threshold`` failures within ``window`` seconds, and from then
+    on ``allow`` refuses calls right away instead of letting each one wait
+    for a timeout. It is closed again by ``close``, once a health probe
+    reaches the dependency. Safe to use from any thread.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, window: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self._state = CLOSED
+        self._failures: "deque[float]" = deque()
+        self._opened_at: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+        self._trips = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        if self._state == CLOSED:
+            return True
+        with self._lock:
+            self._rejected += 1
+        return False
+
+    def record_failure(self, error: object) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_error = str(error)
+            self._failures.append(now)
+            while self._failures and self._failures[0] <= now - self.window:
+                self._failures.popleft()
+            if len(self._failures) >= self.failure_threshold:
+                self._open()
+
+    def trip(self, error: object) -> None:
+        """
+        Open right away, e.g. when a health probe fails.
+        """
+        with self._lock:
+            self._last_error = str(error)
+            self._open()
+
+    def hold(self) -> None:
+        """
+        Refuse calls until ``close`` without counting a trip, e.g. until a
+        dependency is first reached.
+        """
+        with self._lock:
+            self._state = OPEN
+            self._opened_at = datetime.now(timezone.utc)
+
+    def close(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures.clear()
+            self._opened_at = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self._state,
+                "recent_failures": len(self._failures),
+                "opened_at": self._opened_at,
+                "trips": self._trips,
+                "rejected": self._rejected,
+                "last_error": self._last_error,
+            }
+
+    def _open(self) -> None:
+        if self._state == OPEN:
+            return
+        self._state = OPEN
+        self._opened_at = datetime.now(timezone.utc)
+        self._trips += 1
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from dotenv import load_dotenv
 from pydantic import Field, ValidationError
 from pydantic_settings import BaseSettings
@@ -34,6 +36,190 @@ class Settings(BaseSettings):
         json_schema_extra={"env": "ACCESS_TOKEN_EXPIRE_MINUTES"},
     )
 
+    write_db_pool_size: int = Field(
+        10,
+        json_schema_extra={"env": "WRITE_DB_POOL_SIZE"},
+    )
+    write_db_max_overflow: int = Field(
+        10,
+        json_schema_extra={"env": "WRITE_DB_MAX_OVERFLOW"},
+    )
+    write_db_pool_timeout_seconds: float = Field(
+        5.0,
+        json_schema_extra={"env": "WRITE_DB_POOL_TIMEOUT_SECONDS"},
+    )
+    write_db_pool_recycle_seconds: int = Field(
+        1800,
+        json_schema_extra={"env": "WRITE_DB_POOL_RECYCLE_SECONDS"},
+    )
+    write_db_pool_pre_ping: bool = Field(
+        True,
+        json_schema_extra={"env": "WRITE_DB_POOL_PRE_PING"},
+    )
+
+    read_db_max_pool_size: int = Field(
+        50,
+        json_schema_extra={"env": "READ_DB_MAX_POOL_SIZE"},
+    )
+    read_db_min_pool_size: int = Field(
+        0,
+        json_schema_extra={"env": "READ_DB_MIN_POOL_SIZE"},
+    )
+    read_db_max_idle_time_ms: int = Field(
+        300_000,
+        json_schema_extra={"env": "READ_DB_MAX_IDLE_TIME_MS"},
+    )
+    read_db_wait_queue_timeout_ms: int = Field(
+        5000,
+        json_schema_extra={"env": "READ_DB_WAIT_QUEUE_TIMEOUT_MS"},
+    )
+    # Longest a read waits for the server before it counts as a failure
+    read_db_timeout_ms: int = Field(
+        2000,
+        json_schema_extra={"env": "READ_DB_TIMEOUT_MS"},
+    )
+    read_db_breaker_failures: int = Field(
+        3,
+        json_schema_extra={"env": "READ_DB_BREAKER_FAILURES"},
+    )
+    read_db_breaker_window_seconds: float = Field(
+        30.0,
+        json_schema_extra={"env": "READ_DB_BREAKER_WINDOW_SECONDS"},
+    )
+    read_db_health_interval_seconds: float = Field(
+        5.0,
+        json_schema_extra={"env": "READ_DB_HEALTH_INTERVAL_SECONDS"},
+    )
+
+    password_hash_workers: int = Field(
+        4,
+        json_schema_extra={"env": "PASSWORD_HASH_WORKERS"},
+    )
+    password_hash_queue_limit: int = Field(
+        64,
+        json_schema_extra={"env": "PASSWORD_HASH_QUEUE_LIMIT"},
+    )
+
+    token_cache_size: int = Field(
+        10_000,
+        json_schema_extra={"env": "TOKEN_CACHE_SIZE"},
+    )
+
+    projector_batch_size: int = Field(
+        500,
+        json_schema_extra={"env": "PROJECTOR_BATCH_SIZE"},
+    )
+    projector_interval_seconds: float = Field(
+        1.0,
+        json_schema_extra={"env": "PROJECTOR_INTERVAL_SECONDS"},
+    )
+    projector_max_attempts: int = Field(
+        5,
+        json_schema_extra={"env": "PROJECTOR_MAX_ATTEMPTS"},
+    )
+
+    reference_cache_ttl_seconds: float = Field(
+        60.0,
+        json_schema_extra={"env": "REFERENCE_CACHE_TTL_SECONDS"},
+    )
+
+    slow_query_threshold_ms: float = Field(
+        200.0,
+        json_schema_extra={"env": "SLOW_QUERY_THRESHOLD_MS"},
+    )
+
+    archive_dir: str = Field(
+        "archive",
+        json_schema_extra={"env": "ARCHIVE_DIR"},
+    )
+    archive_after_days: int = Field(
+        365,
+        json_schema_extra={"env": "ARCHIVE_AFTER_DAYS"},
+    )
+    archive_batch_size: int = Field(
+        5000,
+        json_schema_extra={"env": "ARCHIVE_BATCH_SIZE"},
+    )
+
+    events_queue_size: int = Field(
+        100,
+        json_schema_extra={"env": "EVENTS_QUEUE_SIZE"},
+    )
+    events_max_dropped: int = Field(
+        1000,
+        json_schema_extra={"env": "EVENTS_MAX_DROPPED"},
+    )
+    events_history: int = Field(
+        1000,
+        json_schema_extra={"env": "EVENTS_HISTORY"},
+    )
+    events_keepalive_seconds: float = Field(
+        15.0,
+        json_schema_extra={"env": "EVENTS_KEEPALIVE_SECONDS"},
+    )
+    events_retry_ms: int = Field(
+        3000,
+        json_schema_extra={"env": "EVENTS_RETRY_MS"},
+    )
+
+    init_db_on_startup: bool = Field(
+        True,
+        json_schema_extra={"env": "INIT_DB_ON_STARTUP"},
+    )
+
+    # Production launcher (python -m app.server)
+    server_host: str = Field(
+        "0.0.0.0",
+        json_schema_extra={"env": "SERVER_HOST"},
+    )
+    server_port: int = Field(
+        8000,
+        json_schema_extra={"env": "SERVER_PORT"},
+    )
+    # 0 starts one worker per CPU core
+    server_workers: int = Field(
+        0,
+        json_schema_extra={"env": "SERVER_WORKERS"},
+    )
+    server_loop: Literal["auto", "uvloop", "asyncio"] = Field(
+        "auto",
+        json_schema_extra={"env": "SERVER_LOOP"},
+    )
+    server_http: Literal["auto", "httptools", "h11"] = Field(
+        "auto",
+        json_schema_extra={"env": "SERVER_HTTP"},
+    )
+    server_backlog: int = Field(
+        2048,
+        json_schema_extra={"env": "SERVER_BACKLOG"},
+    )
+    # Longer than the idle timeout of the load balancer in front
+    server_keep_alive_seconds: int = Field(
+        65,
+        json_schema_extra={"env": "SERVER_KEEP_ALIVE_SECONDS"},
+    )
+    # 0 disables the limit
+    server_limit_concurrency: int = Field(
+        0,
+        json_schema_extra={"env": "SERVER_LIMIT_CONCURRENCY"},
+    )
+    server_max_requests: int = Field(
+        10000,
+        json_schema_extra={"env": "SERVER_MAX_REQUESTS"},
+    )
+    server_max_requests_jitter: int = Field(
+        1000,
+        json_schema_extra={"env": "SERVER_MAX_REQUESTS_JITTER"},
+    )
+    server_graceful_timeout_seconds: int = Field(
+        30,
+        json_schema_extra={"env": "SERVER_GRACEFUL_TIMEOUT_SECONDS"},
+    )
+    server_access_log: bool = Field(
+        True,
+        json_schema_extra={"env": "SERVER_ACCESS_LOG"},
+    )
+
     class Config:
         env_file = ".env"
 
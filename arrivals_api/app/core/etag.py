@@ -0,0 +1,140 @@
+import hashlib
+from typing import Dict, List
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.write_db import Base, get_async_db, write_db
+
+
+def read_model_key(collection: str) -> str:
+    """
+    Version key of the read DB copy of ``collection``, bumped by the
+    projector once it has written a change there.
+    """
+    return f"{collection}:read"
+
+
+class NotModified(Exception):
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+class CollectionVersion(Base):
+    """
+    Write counter of a collection. It is bumped in the transaction of every
+    write to the collection, so all the workers see the same version.
+    """
+
+    __tablename__ = "collection_versions"
+
+    collection = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False)
+
+
+class CollectionVersions:
+    """
+    Per-collection write counters, kept in the write DB and used to build
+    ETags for the list endpoints. A tag only changes when its collection is
+    written to, whichever worker serves the request.
+    """
+
+    @staticmethod
+    def bump(*collections: str):
+        """
+        Statement adding one to the version of each of ``collections``, to
+        execute in the transaction of the write. Rows are locked in name
+        order so concurrent writers cannot deadlock on them.
+        """
+        dialect = write_db.engine.dialect.name
+        insert = (
+            postgresql.insert if dialect == "postgresql" else sqlite.insert
+        )
+        statement = insert(CollectionVersion).values(
+            [
+                {"collection": collection, "version": 1}
+                for collection in sorted(set(collections))
+            ]
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[CollectionVersion.collection],
+            set_={"version": CollectionVersion.version + 1},
+        )
+
+    @staticmethod
+    async def versions(
+        db: AsyncSession, collections: List[str]
+    ) -> Dict[str, int]:
+        result = await db.execute(
+            select(
+                CollectionVersion.collection, CollectionVersion.version
+            ).where(CollectionVersion.collection.in_(collections))
+        )
+        return dict(result.tuples().all())
+
+    async def etag(
+        self,
+        db: AsyncSession,
+        collection: str,
+        variant: str = "",
+        read_model: bool = False,
+    ) -> str:
+        keys = [collection]
+        if read_model:
+            keys.append(read_model_key(collection))
+        versions = await self.versions(db, keys)
+        digest = hashlib.sha1(variant.encode()).hexdigest()[:8]
+        version = ".".join(str(versions.get(key, 0)) for key in keys)
+        return f'W/"{collection}-{version}-{digest}"'
+
+
+collection_versions = CollectionVersions()
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+class ETagCheck:
+    """
+    Dependency for conditional GETs on a collection. Raises ``NotModified``
+    (answered with a bodyless 304) when ``If-None-Match`` holds the current
+    tag, after a single version lookup; otherwise sets the ``ETag`` header
+    and returns the tag. The query string is part of the tag since every
+    page is a different representation.
+
+    Pages of the read model set ``read_model``: their tag changes both when
+    the write DB commits and when the projector has caught up, so a page
+    fetched in between is not kept as current, and a page served by the
+    write DB fallback still follows the writes.
+    """
+
+    def __init__(self, collection: str, read_model: bool = False):
+        self.collection = collection
+        self.read_model = read_model
+
+    async def __call__(
+        self,
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+    ) -> str:
+        etag = await collection_versions.etag(
+            db, self.collection, request.url.query, self.read_model
+        )
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise NotModified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+        return etag
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
@@ -0,0 +1,229 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from pymongo import monitoring
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import (
+    COUNT_BUCKETS,
+    SLOW_QUERY_BUCKETS,
+    Counter,
+    Histogram,
+    registry,
+)
+
+logger = logging.getLogger(__name__)
+
+SQL = "sql"
+MONGO = "mongo"
+# Route label for work done outside a request (projector, startup)
+BACKGROUND = "background"
+UNMATCHED = "unmatched"
+# Slow statements are truncated to keep log lines short
+SLOW_QUERY_TEXT_LIMIT = 200
+
+request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time spent serving HTTP requests.",
+        ("method", "route", "status"),
+    )
+)
+query_duration = registry.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Time spent in single database queries and commands.",
+        ("db", "route"),
+    )
+)
+request_queries = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "Database queries and commands issued per HTTP request.",
+        ("db", "route"),
+        buckets=COUNT_BUCKETS,
+    )
+)
+request_db_time = registry.register(
+    Histogram(
+        "http_request_db_seconds",
+        "Database time per HTTP request.",
+        ("db", "route"),
+    )
+)
+slow_queries = registry.register(
+    Counter(
+        "db_slow_queries_total",
+        "Queries slower than the slow query threshold.",
+        ("db", "route"),
+    )
+)
+slow_query_duration = registry.register(
+    Histogram(
+        "db_slow_query_duration_seconds",
+        "Duration of the queries slower than the slow query threshold.",
+        ("db", "route"),
+        buckets=SLOW_QUERY_BUCKETS,
+    )
+)
+
+
+class RequestStats:
+    """
+    Database work attributed to the request being served.
+    """
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.queries = {SQL: 0, MONGO: 0}
+        self.seconds = {SQL: 0.0, MONGO: 0.0}
+
+    @property
+    def route(self) -> str:
+        # Route template, set on the scope once the router matched it
+        route = self.scope.get("route")
+        return getattr(route, "path", UNMATCHED)
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f'{db};dur={self.seconds[db] * 1000:.1f};desc="{count} queries"'
+            for db, count in self.queries.items()
+            if count
+        )
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request", default=None
+)
+
+
+def record_query(db: str, seconds: float, statement: str) -> None:
+    stats = current_request.get()
+    route = stats.route if stats is not None else BACKGROUND
+    if stats is not None:
+        stats.queries[db] += 1
+        stats.seconds[db] += seconds
+    query_duration.observe(seconds, db, route)
+
+    if seconds * 1000 >= settings.slow_query_threshold_ms:
+        # The statement goes to the log only: as a label it would make a
+        # new series for every query
+        slow_queries.inc(db, route)
+        slow_query_duration.observe(seconds, db, route)
+        logger.warning(
+            "Slow %s query (%.1f ms) on %s: %s",
+            db,
+            seconds * 1000,
+            route,
+            " ".join(statement.split())[:SLOW_QUERY_TEXT_LIMIT],
+        )
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every request by route template and publishing
+    the database work it caused, also as a ``Server-Timing`` header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status = "500"
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                timing = stats.server_timing()
+                if timing:
+                    message.setdefault("headers", []).append(
+                        (b"server-timing", timing.encode())
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_duration.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                stats.route,
+                status,
+            )
+            for db in (SQL, MONGO):
+                request_queries.observe(stats.queries[db], db, stats.route)
+                request_db_time.observe(stats.seconds[db], db, stats.route)
+            current_request.reset(token)
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    start = conn.info["query_start_time"].pop()
+    record_query(SQL, time.perf_counter() - start, statement)
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None:
+        starts = context.connection.info.get("query_start_time")
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement run on ``engine``. For an ``AsyncEngine`` pass its
+    ``sync_engine``.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    Times pymongo commands and attributes them to the current request.
+    """
+
+    def __init__(self):
+        self._started: Dict[Tuple, str] = {}
+
+    def started(self, event) -> None:
+        self._started[(event.connection_id, event.request_id)] = (
+            f"{event.command_name} {event.database_name}."
+            f"{event.command.get(event.command_name)}"
+        )
+
+    def succeeded(self, event) -> None:
+        self._finish(event)
+
+    def failed(self, event) -> None:
+        self._finish(event)
+
+    def _finish(self, event) -> None:
+        statement = self._started.pop(
+            (event.connection_id, event.request_id), event.command_name
+        )
+        record_query(MONGO, event.duration_micros / 1_000_000, statement)
+
+
+mongo_command_listener = MongoCommandListener()
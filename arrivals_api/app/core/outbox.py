@@ -0,0 +1,83 @@
+from typing import Iterable, List
+
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.orm import Session
+
+from app.core.write_db import Base, utcnow
+
+UPSERT = "upsert"
+DELETE = "delete"
+# The row left the write DB for cold storage: its read document goes away,
+# but aggregates built from it keep counting it
+ARCHIVE = "archive"
+
+
+class OutboxEvent(Base):
+    """
+    A pending change to project into the read DB. Rows are written in the
+    same transaction as the change itself and removed once projected.
+    """
+
+    __tablename__ = "outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    aggregate = Column(String, nullable=False)
+    aggregate_id = Column(Integer, nullable=False)
+    operation = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    # Failed projections of this event on its own
+    attempts = Column(Integer, nullable=False, default=0)
+
+
+class FailedOutboxEvent(Base):
+    """
+    An outbox event that could not be projected after the allowed attempts.
+    It is kept here, out of the way of the events behind it, for inspection
+    or to be requeued by hand.
+    """
+
+    __tablename__ = "outbox_failed"
+
+    id = Column(Integer, primary_key=True)
+    aggregate = Column(String, nullable=False)
+    aggregate_id = Column(Integer, nullable=False)
+    operation = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    attempts = Column(Integer, nullable=False)
+    error = Column(String, nullable=True)
+    failed_at = Column(DateTime, nullable=False, default=utcnow)
+
+
+def record_event(
+    db: Session, aggregate: str, aggregate_id: int, operation: str
+) -> None:
+    """
+    Add an outbox row to the session's current transaction. Works with both
+    ``Session`` and ``AsyncSession`` since ``add`` does no I/O.
+    """
+    db.add(
+        OutboxEvent(
+            aggregate=aggregate,
+            aggregate_id=aggregate_id,
+            operation=operation,
+        )
+    )
+
+
+def event_rows(
+    aggregate: str, aggregate_ids: Iterable[int], operation: str
+) -> List[dict]:
+    """
+    Parameters for a bulk ``insert(OutboxEvent)``. Going through Core skips
+    fetching an id back for every event, so a whole batch is one statement.
+    """
+    created_at = utcnow()
+    return [
+        {
+            "aggregate": aggregate,
+            "aggregate_id": aggregate_id,
+            "operation": operation,
+            "created_at": created_at,
+        }
+        for aggregate_id in aggregate_ids
+    ]
@@ -0,0 +1,89 @@
+from typing import (
+    Any,
+    AsyncIterable,
+    Iterable,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
+
+from fastapi import Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-After-Id"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Lines are flushed to the client in chunks rather than one write per row
+NDJSON_CHUNK_ROWS = 500
+
+
+class PageParams:
+    """
+    Keyset pagination parameters shared by the list endpoints. Rows are
+    ordered by id and ``after_id`` is the last id seen by the client.
+    """
+
+    def __init__(
+        self,
+        after_id: Optional[int] = Query(None, ge=0),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        stream: bool = Query(
+            False, description="Stream every row as NDJSON instead."
+        ),
+    ):
+        self.after_id = after_id
+        self.limit = limit
+        self.stream = stream
+
+
+def set_next_cursor(
+    response: Response, items: Sequence[Any], limit: int
+) -> None:
+    """
+    Advertise the cursor for the next page when the current one is full.
+    """
+    if items and len(items) == limit:
+        last = items[-1]
+        last_id = last["id"] if isinstance(last, dict) else last.id
+        response.headers[NEXT_CURSOR_HEADER] = str(last_id)
+
+
+def ndjson_response(
+    rows: Union[Iterable[Any], AsyncIterable[Any]],
+    schema: Type[BaseModel],
+    etag: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Serialize rows one at a time as newline-delimited JSON, so memory stays
+    flat regardless of how many rows the iterator yields. Accepts both sync
+    and async iterators.
+    """
+
+    def encode():
+        lines = []
+        for row in rows:
+            lines.append(schema.model_validate(row).model_dump_json())
+            if len(lines) >= NDJSON_CHUNK_ROWS:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    async def aencode():
+        lines = []
+        async for row in rows:
+            lines.append(schema.model_validate(row).model_dump_json())
+            if len(lines) >= NDJSON_CHUNK_ROWS:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    body = aencode() if hasattr(rows, "__aiter__") else encode()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"} if etag else None
+    return StreamingResponse(
+        body, media_type=NDJSON_MEDIA_TYPE, headers=headers
+    )
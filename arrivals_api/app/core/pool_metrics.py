@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import Optional, Type
+
+from pymongo import monitoring
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Checkout counters shared by the write DB and read DB connection pools:
+    how many connections are handed out, how long callers waited for one
+    and how many gave up on a timeout.
+    """
+
+    def __init__(self, name: str, max_size: Optional[int] = None):
+        self.name = name
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._checked_out = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def checked_out(self, wait_seconds: float) -> None:
+        with self._lock:
+            self._checked_out += 1
+            self._checkouts += 1
+            self._wait_seconds += wait_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+
+    def checked_in(self) -> None:
+        with self._lock:
+            self._checked_out -= 1
+
+    def timed_out(self, wait_seconds: float) -> None:
+        with self._lock:
+            self._timeouts += 1
+            self._wait_seconds += wait_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+
+    def stats(self, overflow: Optional[int] = None) -> dict:
+        with self._lock:
+            waits = (self._checkouts + self._timeouts) or 1
+            return {
+                "name": self.name,
+                "max_size": self.max_size,
+                "checked_out": self._checked_out,
+                "overflow": overflow,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._wait_seconds / waits * 1000, 3),
+                "max_wait_ms": round(self._max_wait_seconds * 1000, 3),
+            }
+
+
+class _TimedPool:
+    """
+    Pool mixin timing every ``connect()``, which covers the wait for a free
+    connection when the pool is exhausted.
+    """
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.timed_out(time.perf_counter() - start)
+            raise
+        self.metrics.checked_out(time.perf_counter() - start)
+        return connection
+
+    def _return_conn(self, record) -> None:
+        self.metrics.checked_in()
+        super()._return_conn(record)
+
+
+def timed_pool_class(pool_class: Type[Pool], metrics: PoolMetrics):
+    # Made per engine so a pool recreated by ``dispose()`` keeps its metrics
+    return type(
+        f"Timed{pool_class.__name__}",
+        (_TimedPool, pool_class),
+        {"metrics": metrics},
+    )
+
+
+def sqlalchemy_pool_stats(pool: Pool) -> dict:
+    metrics: PoolMetrics = pool.metrics
+    overflow = max(pool.overflow(), 0) if isinstance(pool, QueuePool) else None
+    return metrics.stats(overflow)
+
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """
+    Feeds pymongo connection pool events into ``PoolMetrics``.
+    """
+
+    def __init__(self, metrics: PoolMetrics):
+        self.metrics = metrics
+
+    def connection_checked_out(self, event) -> None:
+        self.metrics.checked_out(event.duration or 0.0)
+
+    def connection_checked_in(self, event) -> None:
+        self.metrics.checked_in()
+
+    def connection_check_out_failed(self, event) -> None:
+        if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+            self.metrics.timed_out(event.duration or 0.0)
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        pass
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
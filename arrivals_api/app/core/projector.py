@@ -0,0 +1,476 @@
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+from bson import ObjectId
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import ConnectionFailure
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.circuit_breaker import OPEN
+from app.core.config import settings
+from app.core.etag import collection_versions, read_model_key
+from app.core.outbox import (
+    ARCHIVE,
+    UPSERT,
+    FailedOutboxEvent,
+    OutboxEvent,
+)
+from app.core.read_db import connection_lost, mongodb, read_breaker
+from app.core.write_db import SessionLocal, utcnow
+
+logger = logging.getLogger(__name__)
+
+# Journal of the batches being written, and the pause flag
+STATE_COLLECTION = "projector_state"
+PAUSE = "pause"
+
+
+class Projection:
+    """
+    Describes how one write-side aggregate is projected into a read DB
+    collection. Subclasses build the denormalized documents.
+    """
+
+    aggregate: str
+    collection: str
+    # Whether ``cascade`` needs the read documents as they were before
+    needs_previous: bool = False
+
+    def load(self, db: Session, ids: List[int]) -> List[dict]:
+        """
+        Build the read documents for the given ids. Ids without a row are
+        treated as deleted.
+        """
+        raise NotImplementedError
+
+    def cascade(
+        self, documents: List[dict], previous: List[dict], batch: ObjectId
+    ) -> Dict[str, list]:
+        """
+        Extra write operations, per collection, for documents embedding
+        copies of the projected ones or aggregating them. ``previous`` holds
+        the current read documents of every changed id when
+        ``needs_previous`` is set. A batch may be written more than once, so
+        operations that are not idempotent (increments) must be applied at
+        most once per ``batch``.
+        """
+        return {}
+
+
+class Projector:
+    """
+    Drains the outbox in batches and applies each batch to the read DB with
+    one unordered ``bulk_write`` per collection. Events are only removed
+    from the outbox once the read DB accepted them, so a failed batch is
+    retried, and events that keep failing end up in ``outbox_failed``.
+    Every server worker runs one; a batch is projected by a single worker
+    at a time.
+
+    Projections that need the previous documents compute deltas from
+    them, which would be lost or counted twice if a batch were only partly
+    written and then recomputed. Such batches are journaled in the read
+    DB before being written, and a journaled batch left behind by a failed
+    pass is written again, as it was, before anything else is projected.
+    Operations are written in order, and increments guard themselves
+    against a second write of the same batch.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        interval: float = 1.0,
+        max_attempts: int = 5,
+    ):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self._projections: Dict[str, Projection] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # Size of the largest write announced since the last drain
+        self._drain_hint = 0
+        self._projected = 0
+        self._batches = 0
+        self._last_batch_at: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+
+    def register(self, projection: Projection) -> None:
+        self._projections[projection.aggregate] = projection
+
+    def drain_once(self, limit: Optional[int] = None) -> int:
+        """
+        Project one batch of at most ``limit`` (default ``batch_size``)
+        outbox events. Returns how many were consumed.
+
+        When the batch cannot be projected for any reason other than a lost
+        read DB connection, its events are retried one at a time, so a bad
+        event only holds itself back. An event that fails ``max_attempts``
+        times on its own is moved to the ``outbox_failed`` table.
+        """
+        # While the read DB is down the events wait in the outbox
+        if mongodb.database is None or read_breaker.state == OPEN:
+            return 0
+
+        with SessionLocal() as db:
+            events = db.scalars(
+                select(OutboxEvent)
+                .order_by(OutboxEvent.id)
+                .limit(limit or self.batch_size)
+            ).all()
+            ids = [event.id for event in events]
+            if not events or not self._claim(db, events):
+                return 0
+            try:
+                if not self._apply(db, events):
+                    return 0
+                error = None
+            except Exception as e:
+                db.rollback()
+                error = e
+
+        if error is not None:
+            self._last_error = str(error)
+            logger.error("Error projecting outbox batch: %s", error)
+            if connection_lost(error):
+                return 0
+            if len(ids) == 1:
+                self._record_attempt(ids[0], error)
+                return 0
+            drained = 0
+            for id in ids:
+                if read_breaker.state == OPEN:
+                    break
+                drained += self._drain_event(id)
+            return drained
+
+        self._projected += len(ids)
+        self._batches += 1
+        self._last_batch_at = datetime.now(timezone.utc)
+        self._last_error = None
+        return len(ids)
+
+    def _drain_event(self, id: int) -> int:
+        with SessionLocal() as db:
+            event = db.get(OutboxEvent, id)
+            if event is None or not self._claim(db, [event]):
+                # Projected by another worker in the meantime
+                return 0
+            try:
+                if not self._apply(db, [event]):
+                    return 0
+            except Exception as e:
+                db.rollback()
+                self._last_error = str(e)
+                logger.error("Error projecting outbox event %s: %s", id, e)
+                if not connection_lost(e):
+                    self._record_attempt(id, e)
+                return 0
+        self._projected += 1
+        return 1
+
+    @staticmethod
+    def _claim(db: Session, events: List[OutboxEvent]) -> bool:
+        # The delete locks the rows until commit, so projectors of other
+        # workers wait and then skip them
+        claimed = db.execute(
+            delete(OutboxEvent).where(
+                OutboxEvent.id.in_([event.id for event in events])
+            )
+        ).rowcount
+        if claimed != len(events):
+            db.rollback()
+            return False
+        return True
+
+    def _apply(self, db: Session, events: List[OutboxEvent]) -> bool:
+        """
+        Write the claimed ``events`` to the read DB and commit the claim.
+        False, with the claim released, while the projectors are paused.
+        """
+        state = mongodb.database[STATE_COLLECTION]
+        if self._paused(state):
+            db.rollback()
+            return False
+        self.replay(state)
+
+        changes = self._changes(db, events)
+        batch = ObjectId()
+        journaled = any(
+            self._projections[change["aggregate"]].needs_previous
+            for change in changes
+        )
+        if journaled:
+            state.insert_one(
+                {
+                    "_id": batch,
+                    "changes": changes,
+                    "created_at": datetime.now(timezone.utc),
+                }
+            )
+        operations = self._operations(changes, batch)
+        self._write(operations)
+        if journaled:
+            state.delete_one({"_id": batch})
+        # Committed with the claim: the read model tags of every worker
+        # change once the projection is in place
+        written = [
+            read_model_key(name) for name, ops in operations.items() if ops
+        ]
+        if written:
+            db.execute(collection_versions.bump(*written))
+        db.commit()
+        return True
+
+    def replay(self, state=None) -> int:
+        """
+        Write again the journaled batches a failed pass left behind. Only
+        safe while no other projector is writing (under a claim, or while
+        paused). Returns how many were replayed.
+        """
+        if state is None:
+            state = mongodb.database[STATE_COLLECTION]
+        replayed = 0
+        for entry in state.find({"changes": {"$exists": True}}).sort("_id"):
+            try:
+                self._write(self._operations(entry["changes"], entry["_id"]))
+            except ConnectionFailure:
+                raise
+            except Exception as e:
+                # Replaying it again would fail the same way and hold every
+                # later batch back; a rollup rebuild repairs the drift
+                logger.error(
+                    "Dropping projector batch %s: %s", entry["_id"], e
+                )
+            state.delete_one({"_id": entry["_id"]})
+            replayed += 1
+        return replayed
+
+    @staticmethod
+    def _write(operations: Dict[str, list]) -> None:
+        for collection, ops in operations.items():
+            if ops:
+                mongodb.database[collection].bulk_write(ops, ordered=True)
+
+    @staticmethod
+    def _paused(state) -> bool:
+        pause = state.find_one({"_id": PAUSE})
+        if pause is None:
+            return False
+        until = pause["until"].replace(tzinfo=timezone.utc)
+        return until > datetime.now(timezone.utc)
+
+    @contextmanager
+    def paused(self, timeout: float = 3600.0) -> Iterator[None]:
+        """
+        Hold the projectors of every worker while the block runs, e.g. to
+        rebuild a collection they write to. The batch a projector may be
+        writing is waited for, and the journaled batches are replayed
+        first. The pause lapses after ``timeout`` seconds in case this
+        process dies before lifting it.
+        """
+        state = mongodb.database[STATE_COLLECTION]
+        until = datetime.now(timezone.utc) + timedelta(seconds=timeout)
+        state.replace_one(
+            {"_id": PAUSE}, {"_id": PAUSE, "until": until}, upsert=True
+        )
+        try:
+            self._wait_for_batch()
+            self.replay(state)
+            yield
+        finally:
+            state.delete_one({"_id": PAUSE})
+
+    def _wait_for_batch(self) -> None:
+        # Deleting the oldest events waits for the projector that claimed
+        # them, if any; from then on projectors see the pause
+        with SessionLocal() as db:
+            ids = db.scalars(
+                select(OutboxEvent.id)
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+            ).all()
+            if ids:
+                db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(ids)))
+            db.rollback()
+
+    def _record_attempt(self, id: int, error: Exception) -> None:
+        """
+        Count a failed projection of event ``id`` on its own, and move the
+        event out of the outbox once it used up its attempts.
+        """
+        with SessionLocal() as db:
+            event = db.get(OutboxEvent, id)
+            if event is None:
+                return
+            event.attempts += 1
+            if event.attempts >= self.max_attempts:
+                db.add(
+                    FailedOutboxEvent(
+                        id=event.id,
+                        aggregate=event.aggregate,
+                        aggregate_id=event.aggregate_id,
+                        operation=event.operation,
+                        created_at=event.created_at,
+                        attempts=event.attempts,
+                        error=str(error),
+                    )
+                )
+                db.delete(event)
+                logger.error(
+                    "Outbox event %s (%s %s) moved to outbox_failed after "
+                    "%s attempts: %s",
+                    id,
+                    event.aggregate,
+                    event.aggregate_id,
+                    event.attempts,
+                    error,
+                )
+            db.commit()
+
+    def _changes(self, db: Session, events: List[OutboxEvent]) -> List[dict]:
+        """
+        What each projection has to write for ``events``: the rebuilt
+        documents, the deleted ids and, if needed, the previous documents.
+        Plain documents, so a batch can be journaled and written again.
+        """
+        # Only the last event per aggregate row matters: documents are
+        # rebuilt from the current write-side state.
+        latest: Dict[str, Dict[int, str]] = defaultdict(dict)
+        for event in events:
+            latest[event.aggregate][event.aggregate_id] = event.operation
+
+        changes = []
+        for aggregate, operations in latest.items():
+            projection = self._projections.get(aggregate)
+            if projection is None:
+                continue
+
+            upsert_ids = [id for id, op in operations.items() if op == UPSERT]
+            documents = projection.load(db, upsert_ids) if upsert_ids else []
+            found = {document["_id"] for document in documents}
+            previous = []
+            if projection.needs_previous:
+                # Archived rows stay counted in the aggregates
+                counted = [
+                    id for id, op in operations.items() if op != ARCHIVE
+                ]
+                previous = list(
+                    mongodb.database[projection.collection].find(
+                        {"_id": {"$in": counted}}
+                    )
+                )
+            changes.append(
+                {
+                    "aggregate": aggregate,
+                    "documents": documents,
+                    "deleted": [id for id in operations if id not in found],
+                    "previous": previous,
+                }
+            )
+        return changes
+
+    def _operations(
+        self, changes: List[dict], batch: ObjectId
+    ) -> Dict[str, list]:
+        operations: Dict[str, list] = defaultdict(list)
+        for change in changes:
+            projection = self._projections.get(change["aggregate"])
+            if projection is None:
+                continue
+            ops = operations[projection.collection]
+            ops.extend(
+                ReplaceOne({"_id": document["_id"]}, document, upsert=True)
+                for document in change["documents"]
+            )
+            ops.extend(DeleteOne({"_id": id}) for id in change["deleted"])
+            cascades = projection.cascade(
+                change["documents"], change["previous"], batch
+            )
+            for collection, extra in cascades.items():
+                operations[collection].extend(extra)
+        return operations
+
+    def lag(self) -> dict:
+        with SessionLocal() as db:
+            pending, oldest = db.execute(
+                select(
+                    func.count(OutboxEvent.id),
+                    func.min(OutboxEvent.created_at),
+                )
+            ).one()
+            failed = db.scalar(select(func.count(FailedOutboxEvent.id)))
+
+        lag_seconds = 0.0
+        if oldest is not None:
+            lag_seconds = (
+                utcnow() - oldest.replace(tzinfo=None)
+            ).total_seconds()
+
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending": pending,
+            "oldest_pending_at": oldest,
+            "lag_seconds": round(max(lag_seconds, 0.0), 3),
+            "projected": self._projected,
+            "batches": self._batches,
+            "last_batch_at": self._last_batch_at,
+            "last_error": self._last_error,
+            "failed": failed,
+        }
+
+    def notify(self, events: int = 1) -> None:
+        """
+        Wake the projector up after a write of ``events`` outbox rows. The
+        next drain is widened to take a bulk write in a single batch. Safe
+        to call from any thread.
+        """
+        self._drain_hint = max(self._drain_hint, events)
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._loop = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            limit = max(self.batch_size, self._drain_hint)
+            self._drain_hint = 0
+            try:
+                drained = await asyncio.to_thread(self.drain_once, limit)
+            except Exception as e:
+                self._last_error = str(e)
+                logger.exception("Projector error")
+                drained = 0
+
+            if drained >= limit:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+projector = Projector(
+    batch_size=settings.projector_batch_size,
+    interval=settings.projector_interval_seconds,
+    max_attempts=settings.projector_max_attempts,
+)
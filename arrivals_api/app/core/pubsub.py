@@ -0,0 +1,178 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Dict, Hashable, Optional, Set
+
+
+class Message:
+    __slots__ = ("id", "type", "key", "data")
+
+    def __init__(self, id: int, type: str, key: Hashable, data: str):
+        self.id = id
+        self.type = type
+        self.key = key
+        # Encoded once by the publisher, shared by every subscriber
+        self.data = data
+
+
+class Subscription:
+    """
+    Bounded queue of the messages one subscriber has not consumed yet.
+    When it is full the oldest message is dropped; a subscriber that keeps
+    falling behind for ``max_dropped`` messages in a row is closed.
+    """
+
+    def __init__(
+        self,
+        key: Optional[Hashable],
+        queue_size: int,
+        max_dropped: int,
+    ):
+        self.key = key
+        self.max_dropped = max_dropped
+        self.dropped = 0
+        self.closed = False
+        self._behind = 0
+        self._queue: "asyncio.Queue[Optional[Message]]" = asyncio.Queue(
+            queue_size
+        )
+
+    def matches(self, message: Message) -> bool:
+        return self.key is None or self.key == message.key
+
+    def offer(self, message: Message) -> bool:
+        """
+        Queue ``message`` without waiting. False once the subscriber has
+        been closed as a slow consumer.
+        """
+        if self.closed:
+            return False
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+            self._behind += 1
+            if self._behind >= self.max_dropped:
+                self.close()
+                return False
+        self._queue.put_nowait(message)
+        return True
+
+    async def get(self) -> Optional[Message]:
+        """
+        Next message, or None once the subscription is closed.
+        """
+        message = await self._queue.get()
+        if message is None:
+            self.closed = True
+        else:
+            self._behind = 0
+        return message
+
+    def close(self) -> None:
+        self.closed = True
+        # Wake the consumer even if its queue is full
+        while self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+
+class PubSub:
+    """
+    In-process fan-out of messages to the subscribers of this worker,
+    optionally keyed (e.g. by destination). Publishing never waits for a
+    subscriber: each one has its own bounded ``Subscription``. The last
+    ``history`` messages are kept so a reconnecting subscriber can resume
+    after the last message it saw. Use it from the event loop only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        queue_size: int = 100,
+        max_dropped: int = 1000,
+        history: int = 1000,
+    ):
+        self.name = name
+        self.queue_size = queue_size
+        self.max_dropped = max_dropped
+        # Subscriptions by key; None holds the ones that take every message
+        self._subscriptions: Dict[Optional[Hashable], Set[Subscription]] = {}
+        self._history: "deque[Message]" = deque(maxlen=history)
+        # Ids keep growing across restarts, so a stale resume id replays
+        # nothing instead of hiding the new messages
+        self._ids = itertools.count(time.time_ns() // 1000)
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._disconnected = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscriptions)
+
+    @property
+    def subscribers(self) -> int:
+        return sum(len(group) for group in self._subscriptions.values())
+
+    def subscribe(
+        self,
+        key: Optional[Hashable] = None,
+        last_id: Optional[int] = None,
+    ) -> Subscription:
+        """
+        Subscribe to the messages for ``key`` (all of them if None). With
+        ``last_id``, the kept messages published after it are queued first.
+        """
+        subscription = Subscription(key, self.queue_size, self.max_dropped)
+        if last_id is not None:
+            for message in self._history:
+                if message.id > last_id and subscription.matches(message):
+                    subscription.offer(message)
+        self._subscriptions.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        group = self._subscriptions.get(subscription.key)
+        if group is None or subscription not in group:
+            return
+        group.remove(subscription)
+        if not group:
+            del self._subscriptions[subscription.key]
+        self._dropped += subscription.dropped
+
+    def publish(
+        self, type: str, data: str, key: Optional[Hashable] = None
+    ) -> Message:
+        message = Message(next(self._ids), type, key, data)
+        self._history.append(message)
+        self._published += 1
+        targets = [
+            subscription
+            for key in {None, message.key}
+            for subscription in self._subscriptions.get(key, ())
+        ]
+        for subscription in targets:
+            if subscription.offer(message):
+                self._delivered += 1
+            else:
+                self._disconnected += 1
+                self.unsubscribe(subscription)
+        return message
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "subscribers": self.subscribers,
+            "queue_size": self.queue_size,
+            "published": self._published,
+            "delivered": self._delivered,
+            "dropped": self._dropped
+            + sum(
+                subscription.dropped
+                for group in self._subscriptions.values()
+                for subscription in group
+            ),
+            "slow_disconnects": self._disconnected,
+            "last_id": self._history[-1].id if self._history else 0,
+        }
@@ -1,67 +1,186 @@
-from typing import Generic, List, Optional, Type, TypeVar, Union
+import logging
+from functools import lru_cache
+from typing import Generic, Iterator, List, Optional, Type, TypeVar, Union
 
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pymongo import IndexModel
 from pymongo.collection import Collection
 from pymongo.errors import PyMongoError
 
-from app.core.read_db import connect_to_mongo, mongodb
+from app.core.read_db import (
+    ReadDBUnavailable,
+    connect_to_mongo,
+    connection_lost,
+    mongodb,
+    read_breaker,
+)
+from app.core.read_indexes import register_indexes
+
+logger = logging.getLogger(__name__)
 
 # Define a generic type for Pydantic models
 T = TypeVar("T", bound=BaseModel)
 
 
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[T]) -> TypeAdapter:
+    # Building an adapter compiles a validator, so share one per model
+    return TypeAdapter(List[model])
+
+
 class ReadRepository(Generic[T]):
+    # Declarative indexes, created at startup for ``collection_name``
+    collection_name: Optional[str] = None
+    indexes: List[IndexModel] = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.collection_name and cls.indexes:
+            register_indexes(cls.collection_name, cls.indexes)
+
     def __init__(self, collection_name: str, model: Type[T]):
-        # Ensure the database connection is established
-        if not mongodb.database:
+        # Building the client does not wait for the server
+        if mongodb.database is None:
             connect_to_mongo()
-        self.collection: Collection = mongodb.database[collection_name]
+        self.collection: Optional[Collection] = (
+            mongodb.database[collection_name]
+            if mongodb.database is not None
+            else None
+        )
         self.model = model
+        # Only fetch what the model exposes
+        self.projection = {"_id": 0, **dict.fromkeys(model.model_fields, 1)}
+        self._list_adapter = list_adapter(model)
+
+    @property
+    def available(self) -> bool:
+        """
+        Whether reads can be sent to the read DB right now. When it is
+        down they raise ``ReadDBUnavailable`` without waiting for it.
+        """
+        return self.collection is not None and read_breaker.allow()
+
+    def _check(self) -> None:
+        if not self.available:
+            raise ReadDBUnavailable()
 
     def get_by_id(self, id: Union[int, str]) -> Optional[T]:
         """
         Retrieve a document by its ID.
         """
+        document = self.get_raw_by_id(id)
+        return self.model.model_validate(document) if document else None
+
+    def get_raw_by_id(self, id: Union[int, str]) -> Optional[dict]:
+        """
+        Retrieve a document by its ID as the projected, unvalidated dict.
+        Read-model documents are written by the projector, so they can be
+        served as they are.
+        """
+        self._check()
         try:
-            document = self.collection.find_one({"_id": id})
-            if document:
-                return self.model(**document)
-            return None
+            return self.collection.find_one({"_id": id}, self.projection)
         except PyMongoError as e:
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
             print(f"Error retrieving document by ID: {e}")
             return None
 
-    def get_all(self) -> List[T]:
+    def get_all(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        query: Optional[dict] = None,
+    ) -> List[T]:
+        """
+        Retrieve documents ordered by ID, optionally as a keyset page that
+        starts right after ``after_id``. ``query`` narrows the documents
+        down like a ``find`` filter.
+        """
+        # One validation call for the whole page instead of one per model
+        return self._list_adapter.validate_python(
+            self.get_all_raw(after_id, limit, query)
+        )
+
+    def get_all_raw(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        query: Optional[dict] = None,
+    ) -> List[dict]:
         """
-        Retrieve all documents in the collection.
+        Same page as ``get_all``, as projected and unvalidated dicts.
         """
+        self._check()
         try:
-            documents = self.collection.find()
-            return [self.model(**doc) for doc in documents]
+            cursor = self._keyset_cursor(after_id, query)
+            return list(cursor.limit(limit or 0))
         except PyMongoError as e:
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
             print(f"Error retrieving all documents: {e}")
             return []
 
+    def stream(
+        self,
+        after_id: Optional[int] = None,
+        batch_size: int = 1000,
+        query: Optional[dict] = None,
+    ) -> Iterator[T]:
+        """
+        Yield every document, fetching ``batch_size`` documents per round
+        trip instead of loading the whole collection.
+        """
+        self._check()
+        try:
+            cursor = self._keyset_cursor(after_id, query)
+            cursor = cursor.batch_size(batch_size)
+            for doc in cursor:
+                yield self.model.model_validate(doc)
+        except PyMongoError as e:
+            # Rows may have been sent already: abort the response rather
+            # than end it as if it were complete
+            logger.error("Error streaming documents: %s", e)
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
+            raise
+
+    def _keyset_cursor(
+        self, after_id: Optional[int], query: Optional[dict] = None
+    ):
+        query = dict(query or {})
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
+        return self.collection.find(query, self.projection).sort("_id", 1)
+
     def find_by_field(self, field: str, value: Union[str, int]) -> Optional[T]:
         """
         Retrieve a document by a specific field and value.
         """
+        self._check()
         try:
-            document = self.collection.find_one({field: value})
+            document = self.collection.find_one(
+                {field: value}, self.projection
+            )
             if document:
-                return self.model(**document)
+                return self.model.model_validate(document)
             return None
         except PyMongoError as e:
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
             print(f"Error retrieving document by {field}: {e}")
             return None
 
-    def insert_one(self, data: dict) -> bool:
+    def insert_one(self, data: Union[dict, T]) -> bool:
         """
-        Insert a single document into the collection.
+        Insert a single document into the collection. Dicts are validated
+        against the schema; model instances are already valid and are only
+        dumped.
         """
         try:
-            validated_data = self.model(**data)  # Validate against the schema
-            self.collection.insert_one(validated_data.model_dump())
+            if not isinstance(data, self.model):
+                data = self.model.model_validate(data)
+            self.collection.insert_one(data.model_dump())
             return True
         except ValidationError as ve:
             print(f"Validation error: {ve}")
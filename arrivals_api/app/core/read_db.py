@@ -1,5 +1,74 @@
-from pymongo import MongoClient, errors
+from pymongo import AsyncMongoClient, MongoClient, errors
+from pymongo.errors import PyMongoError
+
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
+from app.core.instrumentation import mongo_command_listener
+from app.core.pool_metrics import MongoPoolListener, PoolMetrics
+from app.core.threaded_mongo import ThreadedDatabase
+
+MONGOMOCK_SCHEME = "mongomock://"
+
+
+class ReadDBUnavailable(Exception):
+    pass
+
+
+# Marks the responses of read-model endpoints served by the write DB
+READ_SOURCE_HEADER = "X-Read-Source"
+WRITE_DB_SOURCE = "write-db"
+
+# Open while the read DB cannot be reached; reads then go to the write DB
+read_breaker = CircuitBreaker(
+    "read_db",
+    failure_threshold=settings.read_db_breaker_failures,
+    window=settings.read_db_breaker_window_seconds,
+)
+
+
+def connection_lost(error: PyMongoError) -> bool:
+    """
+    Whether ``error`` means the read DB could not be reached. Such errors
+    are counted by ``read_breaker``.
+    """
+    if isinstance(error, errors.ConnectionFailure):
+        read_breaker.record_failure(error)
+        return True
+    return False
+
+
+def create_mongo_client(url: str, **kwargs) -> MongoClient:
+    """
+    Build a client for the read DB. URLs using the ``mongomock://`` scheme
+    get an in-memory mongomock client, handy for local runs and benchmarks.
+    """
+    if url.startswith(MONGOMOCK_SCHEME):
+        import mongomock
+
+        return mongomock.MongoClient(
+            url.replace(MONGOMOCK_SCHEME, "mongodb://", 1), **kwargs
+        )
+    return MongoClient(url, **kwargs)
+
+
+read_pool_metrics = PoolMetrics("read_db", settings.read_db_max_pool_size)
+async_read_pool_metrics = PoolMetrics(
+    "read_db_async", settings.read_db_max_pool_size
+)
+
+
+def client_options(metrics: PoolMetrics) -> dict:
+    return {
+        "serverSelectionTimeoutMS": settings.read_db_timeout_ms,
+        "maxPoolSize": settings.read_db_max_pool_size,
+        "minPoolSize": settings.read_db_min_pool_size,
+        "maxIdleTimeMS": settings.read_db_max_idle_time_ms,
+        "waitQueueTimeoutMS": settings.read_db_wait_queue_timeout_ms,
+        "event_listeners": [
+            MongoPoolListener(metrics),
+            mongo_command_listener,
+        ],
+    }
 
 
 class MongoDB:
@@ -8,20 +77,19 @@ class MongoDB:
         self.database = None
 
     def connect(self):
+        """
+        Build the client without waiting for the server: PyMongo connects
+        in the background, and ``ReadDBMonitor`` reports when it answers.
+        """
         try:
-            self.client = MongoClient(
-                settings.read_db_url, serverSelectionTimeoutMS=5000
+            self.client = create_mongo_client(
+                settings.read_db_url, **client_options(read_pool_metrics)
             )
             self.database = self.client[settings.read_db_name]
-            # Trigger a server selection to verify the connection
-            self.client.admin.command("ping")
-            print("Connected to MongoDB")
-        except errors.ServerSelectionTimeoutError as e:
-            print(f"Failed to connect to MongoDB: {e}")
-            self.client = None
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
             self.client = None
+            self.database = None
 
     def close(self):
         if self.client:
@@ -32,8 +100,45 @@ class MongoDB:
                 print(f"Error while disconnecting from MongoDB: {e}")
 
 
+class AsyncMongoDB:
+    """
+    Asyncio-native read DB client (PyMongo's async API). Connected once by
+    the application lifespan, never from inside a request.
+    """
+
+    def __init__(self):
+        self.client: AsyncMongoClient = None
+        self.database = None
+
+    async def connect(self):
+        if settings.read_db_url.startswith(MONGOMOCK_SCHEME):
+            # mongomock has no async API: share the in-memory sync client
+            if mongodb.database is not None:
+                self.database = ThreadedDatabase(mongodb.database)
+            return
+        try:
+            self.client = AsyncMongoClient(
+                settings.read_db_url, **client_options(async_read_pool_metrics)
+            )
+            self.database = self.client[settings.read_db_name]
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+            self.client = None
+            self.database = None
+
+    async def close(self):
+        self.database = None
+        if self.client:
+            try:
+                await self.client.close()
+            except Exception as e:
+                print(f"Error while disconnecting from MongoDB: {e}")
+            self.client = None
+
+
 # Instantiate MongoDB
 mongodb = MongoDB()
+async_mongodb = AsyncMongoDB()
 
 
 # Helper functions for connection lifecycle
@@ -43,3 +148,11 @@ def connect_to_mongo():
 
 def close_mongo_connection():
     mongodb.close()
+
+
+async def connect_to_mongo_async():
+    await async_mongodb.connect()
+
+
+async def close_mongo_connection_async():
+    await async_mongodb.close()
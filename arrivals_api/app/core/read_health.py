@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.circuit_breaker import CLOSED, CircuitBreaker
+from app.core.config import settings
+from app.core.read_db import mongodb, read_breaker
+from app.core.read_indexes import ensure_indexes
+
+logger = logging.getLogger(__name__)
+
+
+class ReadDBMonitor:
+    """
+    Pings the read DB every ``interval`` seconds in the background. A
+    failed ping opens ``breaker``, and the first ping that answers closes
+    it again, so requests never wait on a read DB that is down. The
+    declared indexes are created once the server is first reached.
+    """
+
+    def __init__(self, breaker: CircuitBreaker, interval: float = 5.0):
+        self.breaker = breaker
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._indexes_ready = False
+        self._last_check_at: Optional[datetime] = None
+        self._last_ok_at: Optional[datetime] = None
+        self._latency_ms: Optional[float] = None
+
+    def start(self) -> None:
+        # Reads go to the write DB until the server has answered once
+        self.breaker.hold()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def check(self) -> bool:
+        self._last_check_at = datetime.now(timezone.utc)
+        if mongodb.client is None:
+            self.breaker.trip("Read DB client not configured")
+            return False
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(mongodb.client.admin.command, "ping")
+        except Exception as e:
+            self.breaker.trip(e)
+            return False
+        self._latency_ms = round((time.perf_counter() - start) * 1000, 3)
+        self._last_ok_at = datetime.now(timezone.utc)
+
+        if not self._indexes_ready:
+            # Read DB errors are reported per collection by ensure_indexes;
+            # anything else would fail again, and missing indexes must not
+            # keep the reads on the write DB
+            try:
+                await asyncio.to_thread(ensure_indexes, mongodb.database)
+            except Exception:
+                logger.exception("Could not create the read DB indexes")
+            self._indexes_ready = True
+        if self.breaker.state != CLOSED:
+            print("Connected to MongoDB")
+        self.breaker.close()
+        return True
+
+    def stats(self) -> dict:
+        return {
+            **self.breaker.stats(),
+            "last_check_at": self._last_check_at,
+            "last_ok_at": self._last_ok_at,
+            "ping_ms": self._latency_ms,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception:
+                # The loop is the only thing that closes the breaker
+                logger.exception("Read DB health check failed")
+            await asyncio.sleep(self.interval)
+
+
+read_db_monitor = ReadDBMonitor(
+    read_breaker, settings.read_db_health_interval_seconds
+)
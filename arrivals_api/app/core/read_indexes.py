@@ -0,0 +1,72 @@
+import logging
+from typing import Dict, List, Optional
+
+from pymongo import IndexModel
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Indexes declared by the read repositories, per collection
+index_registry: Dict[str, List[IndexModel]] = {}
+
+
+def register_indexes(collection: str, indexes: List[IndexModel]) -> None:
+    declared = index_registry.setdefault(collection, [])
+    names = {index.document["name"] for index in declared}
+    declared.extend(
+        index for index in indexes if index.document["name"] not in names
+    )
+
+
+def ensure_indexes(database: Database) -> Dict[str, List[str]]:
+    """
+    Create every declared index. ``create_indexes`` is a no-op for indexes
+    that already exist with the same definition, so this is safe to run on
+    every startup.
+    """
+    created = {}
+    for collection, indexes in index_registry.items():
+        try:
+            created[collection] = database[collection].create_indexes(indexes)
+        except PyMongoError as e:
+            logger.error("Error creating indexes on %s: %s", collection, e)
+    return created
+
+
+def _index_usage(database: Database, collection: str) -> Optional[dict]:
+    try:
+        return {
+            stats["name"]: stats["accesses"]["ops"]
+            for stats in database[collection].aggregate([{"$indexStats": {}}])
+        }
+    except (PyMongoError, NotImplementedError):
+        # $indexStats needs a real server and the clusterMonitor role
+        return None
+
+
+def index_report(database: Database) -> List[dict]:
+    """
+    Compare the declared indexes with the ones in the database: declared
+    but missing, present but undeclared, and (when the server reports
+    usage) declared indexes with no recorded use since the last restart.
+    """
+    report = []
+    for collection, indexes in index_registry.items():
+        declared = [index.document["name"] for index in indexes]
+        existing = set(database[collection].index_information()) - {"_id_"}
+        usage = _index_usage(database, collection)
+        report.append(
+            {
+                "collection": collection,
+                "declared": declared,
+                "missing": [name for name in declared if name not in existing],
+                "undeclared": sorted(existing - set(declared)),
+                "unused": (
+                    None
+                    if usage is None
+                    else [name for name in declared if usage.get(name) == 0]
+                ),
+            }
+        )
+    return report
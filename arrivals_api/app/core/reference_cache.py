@@ -0,0 +1,160 @@
+import time
+from typing import (
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+
+from app.core.async_write_base_repository import AsyncBaseRepository
+
+T = TypeVar("T")
+S = TypeVar("S", bound=BaseModel)
+
+
+class ReferenceCache(Generic[S]):
+    """
+    In-process snapshot of a small, rarely changing table, keyed by id.
+    The whole table is loaded at once and kept until a local write bumps
+    the version or ``ttl`` seconds pass (which bounds staleness for writes
+    made by other workers).
+    """
+
+    def __init__(self, name: str, ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self.version = 0
+        self._rows: Optional[Dict[int, S]] = None
+        self._loaded_at = 0.0
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+
+    def get_rows(self) -> Optional[Dict[int, S]]:
+        if self._rows is not None and (
+            time.monotonic() - self._loaded_at < self.ttl
+        ):
+            self._hits += 1
+            return self._rows
+        self._misses += 1
+        return None
+
+    def store(self, rows: Dict[int, S], version: int) -> None:
+        # A write that landed while the rows were loading makes them stale
+        if version == self.version:
+            self._rows = rows
+            self._loaded_at = time.monotonic()
+            self._loads += 1
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._rows = None
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "size": len(self._rows) if self._rows is not None else 0,
+            "version": self.version,
+            "hits": self._hits,
+            "misses": self._misses,
+            "loads": self._loads,
+            "age_seconds": (
+                round(time.monotonic() - self._loaded_at, 3)
+                if self._rows is not None
+                else None
+            ),
+        }
+
+
+class CachedReferenceRepository(AsyncBaseRepository[T], Generic[T, S]):
+    """
+    Repository for reference tables that serves reads from a
+    ``ReferenceCache`` of ``schema`` snapshots. Writes go to the database
+    and invalidate the cache once committed.
+    """
+
+    cache: ReferenceCache
+    schema: Type[S]
+
+    async def get_cached(self, id: int) -> Optional[S]:
+        return (await self._rows()).get(id)
+
+    async def get_all_cached(
+        self, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[S]:
+        rows = [
+            row
+            for id, row in sorted((await self._rows()).items())
+            if after_id is None or id > after_id
+        ]
+        return rows[:limit] if limit is not None else rows
+
+    async def get_many(self, ids: Iterable[int]) -> Dict[int, S]:
+        """
+        Resolve several ids from memory. Unknown ids force one reload, in
+        case they were created by another worker.
+        """
+        ids = set(ids)
+        rows = await self._rows()
+        if not ids.issubset(rows):
+            self.cache.invalidate()
+            rows = await self._rows()
+        return {id: rows[id] for id in ids if id in rows}
+
+    async def create(self, obj: T) -> T:
+        try:
+            return await super().create(obj)
+        finally:
+            self.cache.invalidate()
+
+    async def update(self, obj: T, data: dict) -> T:
+        try:
+            return await super().update(obj, data)
+        finally:
+            self.cache.invalidate()
+
+    async def update_by_id(self, id: int, changes: dict) -> Optional[T]:
+        try:
+            return await super().update_by_id(id, changes)
+        finally:
+            self.cache.invalidate()
+
+    async def delete_by_id(self, id: int) -> bool:
+        try:
+            return await super().delete_by_id(id)
+        finally:
+            self.cache.invalidate()
+
+    async def create_many(self, rows: List[dict]) -> List[int]:
+        try:
+            return await super().create_many(rows)
+        finally:
+            self.cache.invalidate()
+
+    async def update_many(self, rows: List[dict]) -> List[int]:
+        try:
+            return await super().update_many(rows)
+        finally:
+            self.cache.invalidate()
+
+    async def delete_many(self, ids: List[int]) -> List[int]:
+        try:
+            return await super().delete_many(ids)
+        finally:
+            self.cache.invalidate()
+
+    async def _rows(self) -> Dict[int, S]:
+        rows = self.cache.get_rows()
+        if rows is None:
+            version = self.cache.version
+            rows = {
+                obj.id: self.schema.model_validate(obj)
+                for obj in await super().get_all()
+            }
+            self.cache.store(rows, version)
+        return rows
@@ -0,0 +1,25 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Encode plain Python data (dicts, lists, datetimes) straight to JSON
+    bytes, without building models first.
+    """
+    return orjson.dumps(content)
+
+
+class JSONBytesResponse(JSONResponse):
+    """
+    JSON response encoded with orjson. Content that is already encoded
+    (``bytes``) is sent as is, so endpoints can hand over documents they
+    serialized themselves and skip FastAPI's ``response_model`` pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dump_json(content)
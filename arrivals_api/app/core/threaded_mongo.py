@@ -0,0 +1,85 @@
+import asyncio
+from itertools import islice
+from typing import List, Optional
+
+# Documents fetched per worker thread hop while iterating a cursor
+THREAD_BATCH_SIZE = 500
+
+
+class ThreadedCursor:
+    """
+    Async cursor over a blocking one, pulling documents in batches from a
+    worker thread. Mirrors the part of PyMongo's ``AsyncCursor`` used by
+    the async read repositories.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._batch_size = THREAD_BATCH_SIZE
+
+    def sort(self, *args, **kwargs) -> "ThreadedCursor":
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, limit: int) -> "ThreadedCursor":
+        self._cursor = self._cursor.limit(limit)
+        return self
+
+    def batch_size(self, batch_size: int) -> "ThreadedCursor":
+        self._batch_size = batch_size or THREAD_BATCH_SIZE
+        return self
+
+    async def _batches(self):
+        while True:
+            batch = await asyncio.to_thread(
+                lambda: list(islice(self._cursor, self._batch_size))
+            )
+            if batch:
+                yield batch
+            if len(batch) < self._batch_size:
+                return
+
+    async def __aiter__(self):
+        async for batch in self._batches():
+            for document in batch:
+                yield document
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        documents = []
+        async for batch in self._batches():
+            documents.extend(batch)
+            if length is not None and len(documents) >= length:
+                return documents[:length]
+        return documents
+
+
+class ThreadedCollection:
+    def __init__(self, collection):
+        self._collection = collection
+
+    async def find_one(self, *args, **kwargs) -> Optional[dict]:
+        return await asyncio.to_thread(
+            self._collection.find_one, *args, **kwargs
+        )
+
+    def find(self, *args, **kwargs) -> ThreadedCursor:
+        return ThreadedCursor(self._collection.find(*args, **kwargs))
+
+    async def aggregate(self, pipeline: list, **kwargs) -> ThreadedCursor:
+        cursor = await asyncio.to_thread(
+            self._collection.aggregate, pipeline, **kwargs
+        )
+        return ThreadedCursor(cursor)
+
+
+class ThreadedDatabase:
+    """
+    Async facade over a blocking database such as mongomock, which has no
+    async API, so the async read repositories also run on local setups.
+    """
+
+    def __init__(self, database):
+        self._database = database
+
+    def __getitem__(self, name: str) -> ThreadedCollection:
+        return ThreadedCollection(self._database[name])
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+R = TypeVar("R")
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class BoundedExecutor:
+    """
+    Thread pool for CPU-heavy calls that release the GIL (such as bcrypt),
+    so they run off the event loop. At most ``max_workers`` calls run at once
+    and at most ``queue_limit`` more wait; further calls are rejected instead
+    of piling up behind a burst.
+    """
+
+    def __init__(self, name: str, max_workers: int, queue_limit: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+        self._max_latency_seconds = 0.0
+
+    async def run(self, fn: Callable[..., R], *args) -> R:
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_limit:
+                self._rejected += 1
+                raise QueueFullError(f"{self.name} executor is saturated")
+            self._pending += 1
+            self._submitted += 1
+
+        submitted_at = time.perf_counter()
+
+        def task() -> R:
+            started_at = time.perf_counter()
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._wait_seconds += started_at - submitted_at
+                    self._run_seconds += finished_at - started_at
+                    self._max_latency_seconds = max(
+                        self._max_latency_seconds, finished_at - submitted_at
+                    )
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, task)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queue_limit": self.queue_limit,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 3),
+                "avg_run_ms": round(self._run_seconds / completed * 1000, 3),
+                "max_latency_ms": round(self._max_latency_seconds * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,65 +1,203 @@
-from typing import Generic, List, Type, TypeVar
+from typing import (
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
+from sqlalchemy import delete, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import LoaderOption
 
-from app.core.write_db import get_db
+from app.core.etag import collection_versions
+from app.core.outbox import DELETE, UPSERT, record_event
+from app.core.projector import projector
+from app.core.write_db import SessionLocal
 
 T = TypeVar("T")
 
 
 class BaseRepository(Generic[T]):
     _instance = None
+    # Read-model aggregate name; when set, writes are recorded in the outbox
+    aggregate: Optional[str] = None
+    # Collections whose representations embed this aggregate's rows; their
+    # ETag versions are bumped along with its own
+    embedded_in: Tuple[str, ...] = ()
 
-    def __init__(self, model: Type[T], db: Session):
+    def __init__(
+        self,
+        model: Type[T],
+        db: Session,
+        loader_options: Sequence[LoaderOption] = (),
+    ):
         self.model = model
         self.db = db
+        # Relationship loading strategy (selectinload, joinedload...) used
+        # by every read unless a call passes its own ``options``
+        self.loader_options = tuple(loader_options)
 
-    def get(self, id: int) -> T:
-        return self.db.query(self.model).get(id)
+    def get(
+        self, id: int, options: Optional[Sequence[LoaderOption]] = None
+    ) -> Optional[T]:
+        return self.db.get(self.model, id, options=self._options(options))
 
-    def get_all(self) -> List[T]:
-        return self.db.query(self.model).all()
+    def get_all(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        options: Optional[Sequence[LoaderOption]] = None,
+    ) -> List[T]:
+        """
+        Retrieve rows ordered by id, optionally as a keyset page that starts
+        right after ``after_id``.
+        """
+        query = self._keyset_query(self.db, after_id, options)
+        return query.limit(limit).all()
+
+    def stream(
+        self,
+        after_id: Optional[int] = None,
+        batch_size: int = 1000,
+        options: Optional[Sequence[LoaderOption]] = None,
+    ) -> Iterator[T]:
+        """
+        Yield every row through a server-side cursor, ``batch_size`` rows at
+        a time. The stream owns its session so it can outlive the request
+        scoped one while the response is being sent.
+        """
+        with SessionLocal() as db:
+            query = self._keyset_query(db, after_id, options)
+            for obj in query.yield_per(batch_size):
+                yield obj
+
+    def _record(self, id: int, operation: str) -> None:
+        if self.aggregate:
+            record_event(self.db, self.aggregate, id, operation)
+            self.db.execute(
+                collection_versions.bump(self.aggregate, *self.embedded_in)
+            )
+
+    def _notify(self) -> None:
+        if self.aggregate:
+            projector.notify()
+
+    def _options(
+        self, options: Optional[Sequence[LoaderOption]]
+    ) -> Sequence[LoaderOption]:
+        return self.loader_options if options is None else tuple(options)
+
+    def _reload(self, obj: T) -> T:
+        # Re-read through the loader options so relationships are loaded
+        return self.db.get(
+            self.model,
+            obj.id,
+            options=self.loader_options,
+            populate_existing=True,
+        )
+
+    def _keyset_query(
+        self,
+        db: Session,
+        after_id: Optional[int],
+        options: Optional[Sequence[LoaderOption]] = None,
+    ):
+        query = db.query(self.model).options(*self._options(options))
+        if after_id is not None:
+            query = query.filter(self.model.id > after_id)
+        return query.order_by(self.model.id)
 
     def create(self, obj: T) -> T:
         try:
             self.db.add(obj)
+            self.db.flush()
+            self._record(obj.id, UPSERT)
             self.db.commit()
-            self.db.refresh(obj)
-            return obj
+            self._notify()
+            return self._reload(obj)
         except IntegrityError as e:
             self.db.rollback()
-            self.refresh_db()
             raise ValueError(self._parse_integrity_error(e))
 
     def update(self, obj: T) -> T:
         try:
             self.db.merge(obj)
+            self._record(obj.id, UPSERT)
             self.db.commit()
+            self._notify()
             return obj
         except IntegrityError as e:
             self.db.rollback()
-            self.refresh_db()
             raise ValueError(self._parse_integrity_error(e))
 
     def delete(self, id: int) -> None:
-        obj = self.get(id)
-        self.db.delete(obj)
-        self.db.commit()
+        self.delete_by_id(id)
 
-    def refresh_db(self):
-        self.db = next(get_db())
+    def update_by_id(self, id: int, changes: dict) -> Optional[T]:
+        """
+        Write ``changes`` to row ``id`` with a single UPDATE ... RETURNING,
+        touching only the given columns. Returns the updated row, or
+        ``None`` when there is no such row.
+        """
+        if not changes:
+            return self.get(id)
+        try:
+            obj = self.db.scalar(
+                update(self.model)
+                .where(self.model.id == id)
+                .values(**changes)
+                .returning(self.model)
+                .execution_options(populate_existing=True)
+            )
+            if obj is None:
+                self.db.rollback()
+                return None
+            self._record(id, UPSERT)
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(self._parse_integrity_error(e))
+        self._notify()
+        return obj
 
-    def _parse_integrity_error(self, error: IntegrityError) -> str:
-        orig_msg = str(error.orig)
-        err_msg = orig_msg.split(":")[-1].replace("\n", "").strip()
-
-        parts = err_msg.split(".")
-        if len(parts) >= 2:
-            table, column = parts[-2], parts[-1]
-            return (
-                f"Duplicate entry for {column} in {table}."
-                "Please choose a different value."
+    def delete_by_id(self, id: int) -> bool:
+        """
+        Delete row ``id`` with a single DELETE. Returns whether it existed.
+        """
+        try:
+            result = self.db.execute(
+                delete(self.model).where(self.model.id == id)
             )
-        else:
-            return "An error occurred while processing your request."
+            if not result.rowcount:
+                self.db.rollback()
+                return False
+            self._record(id, DELETE)
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(self._parse_integrity_error(e))
+        self._notify()
+        return True
+
+    def _parse_integrity_error(self, error: IntegrityError) -> str:
+        return parse_integrity_error(error)
+
+
+def parse_integrity_error(error: IntegrityError) -> str:
+    orig_msg = str(error.orig)
+    err_msg = orig_msg.split(":")[-1].replace("\n", "").strip()
+
+    parts = err_msg.split(".")
+    if len(parts) >= 2:
+        table, column = parts[-2], parts[-1]
+        return (
+            f"Duplicate entry for {column} in {table}."
+            "Please choose a different value."
+        )
+    else:
+        return "An error occurred while processing your request."
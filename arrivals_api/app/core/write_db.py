@@ -1,14 +1,208 @@
 # flake8: noqa: F401
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
 from passlib.context import CryptContext
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, declarative_base, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Session,
+    declarative_base,
+    sessionmaker,
+)
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
+from app.core.pool_metrics import PoolMetrics, timed_pool_class
 
 SQLALCHEMY_DATABASE_URL = settings.write_db_url
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def pool_options(url: URL, name: str) -> dict:
+    """
+    Pool settings for an engine on ``url``. Sizing only applies to queue
+    pools; dialects that default to another pool (aiosqlite, in-memory
+    SQLite) keep it and only get pre-ping and recycle.
+    """
+    pool_class = url.get_dialect().get_pool_class(url)
+    options = {
+        "pool_pre_ping": settings.write_db_pool_pre_ping,
+        "pool_recycle": settings.write_db_pool_recycle_seconds,
+    }
+    max_size = None
+    if issubclass(pool_class, QueuePool):
+        options.update(
+            pool_size=settings.write_db_pool_size,
+            max_overflow=settings.write_db_max_overflow,
+            pool_timeout=settings.write_db_pool_timeout_seconds,
+        )
+        max_size = settings.write_db_pool_size + max(
+            settings.write_db_max_overflow, 0
+        )
+    options["poolclass"] = timed_pool_class(
+        pool_class, PoolMetrics(name, max_size)
+    )
+    return options
+
+
+# Async drivers used for the same database by the async write path
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> URL:
+    sa_url = make_url(url)
+    backend = sa_url.get_backend_name()
+    return sa_url.set(drivername=ASYNC_DRIVERS.get(backend, sa_url.drivername))
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # WAL lets readers run alongside the single writer, and concurrent
+    # writers wait for the lock instead of failing with "database is locked".
+    # SQLite only enforces foreign keys when asked to, per connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def utcnow() -> datetime:
+    """
+    The current UTC time as the write DB stores it. Its ``DateTime`` columns
+    are naive, and asyncpg rejects aware values for them.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    ``value`` as the write DB stores it: aware datetimes are converted to
+    naive UTC, naive ones are taken to be UTC already.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class WriteDB:
+    """
+    Sync and async engines of the write DB with their session factories.
+    They are created on first use in each process, never at import time,
+    so server workers each open their own pools after they start. A
+    process forked with engines already built drops the inherited pools
+    without closing the parent's connections.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.async_url = to_async_url(url)
+        self._engine: Optional[Engine] = None
+        self._async_engine: Optional[AsyncEngine] = None
+        self._session_factory: Optional[sessionmaker] = None
+        self._async_session_factory: Optional[async_sessionmaker] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> Engine:
+        self._ensure()
+        return self._engine
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        self._ensure()
+        return self._async_engine
+
+    def session(self) -> Session:
+        self._ensure()
+        return self._session_factory()
+
+    def async_session(self) -> AsyncSession:
+        self._ensure()
+        return self._async_session_factory()
+
+    async def dispose(self) -> None:
+        """
+        Close the pooled connections of this process. The engines are built
+        again on next use.
+        """
+        if self._pid == os.getpid():
+            await self._async_engine.dispose()
+            self._engine.dispose()
+        self._engine = None
+        self._async_engine = None
+        self._session_factory = None
+        self._async_session_factory = None
+        self._pid = None
+
+    def _ensure(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._engine is not None:
+                # Inherited from the parent: forget the pooled connections
+                self._engine.dispose(close=False)
+                self._async_engine.sync_engine.dispose(close=False)
+            self._create()
+
+    def _create(self) -> None:
+        connect_args = {}
+        if self.url.startswith("sqlite"):
+            # FastAPI serves sync endpoints from a thread pool
+            connect_args["check_same_thread"] = False
+        engine = create_engine(
+            self.url,
+            connect_args=connect_args,
+            **pool_options(make_url(self.url), "write_db"),
+        )
+        async_engine = create_async_engine(
+            self.async_url,
+            **pool_options(self.async_url, "write_db_async"),
+        )
+
+        instrument_engine(engine)
+        instrument_engine(async_engine.sync_engine)
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", _sqlite_pragmas)
+            event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+
+        self._engine = engine
+        self._async_engine = async_engine
+        self._session_factory = sessionmaker(
+            autocommit=False, autoflush=False, bind=engine
+        )
+        self._async_session_factory = async_sessionmaker(
+            bind=async_engine, autoflush=False, expire_on_commit=False
+        )
+        self._pid = os.getpid()
+
+
+write_db = WriteDB(SQLALCHEMY_DATABASE_URL)
+
+
+def SessionLocal() -> Session:
+    return write_db.session()
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    return write_db.async_session()
+
+
 Base: DeclarativeBase = declarative_base()
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -22,12 +216,19 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
+    from app.core.etag import CollectionVersion
+    from app.core.outbox import OutboxEvent
     from app.features.users.models import User
     from app.features.visits.models import Destination, Visit, VisitType
 
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.drop_all(bind=write_db.engine)
+    Base.metadata.create_all(bind=write_db.engine)
 
     db = SessionLocal()
 
@@ -0,0 +1,110 @@
+import time
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.projector import projector
+from app.core.read_db import ReadDBUnavailable
+from app.features.reports.read_repo import (
+    AsyncVisitRollupRepository,
+    VisitRollupRepository,
+)
+from app.features.reports.rollups import (
+    DAY,
+    DESTINATION,
+    HOUR,
+    TOTAL,
+    VISIT_TYPE,
+    rebuild_rollups,
+)
+from app.features.reports.schemas import (
+    RollupRebuild,
+    VisitBucket,
+    VisitReport,
+    VisitRollup,
+)
+from app.features.visits.archive import visit_archive
+from app.features.visits.export import row_document
+from app.features.visits.read_repo import VisitRepository
+
+report_router = APIRouter(prefix="/reports", tags=["Reports"])
+
+
+def _average_minutes(rollup: VisitRollup) -> Optional[float]:
+    if rollup.closed_count <= 0:
+        return None
+    return round(rollup.duration_seconds / rollup.closed_count / 60, 2)
+
+
+def _buckets(rollups: List[VisitRollup], dimension: str) -> List[VisitBucket]:
+    return sorted(
+        (
+            VisitBucket(
+                key=rollup.key,
+                label=rollup.label,
+                visits=rollup.count,
+                average_duration_minutes=_average_minutes(rollup),
+            )
+            for rollup in rollups
+            if rollup.dimension == dimension and rollup.count > 0
+        ),
+        key=lambda bucket: bucket.key,
+    )
+
+
+@report_router.get("/visits", response_model=VisitReport)
+async def visit_report(
+    day_from: Optional[date] = Query(None, alias="from"),
+    day_to: Optional[date] = Query(None, alias="to"),
+    repo: AsyncVisitRollupRepository = Depends(AsyncVisitRollupRepository),
+):
+    """
+    Visit metrics read from the pre-aggregated rollups, so the cost depends
+    on the number of buckets and not on the number of visits. ``from`` and
+    ``to`` limit the per-day series. The rollups also count archived
+    visits, which the write DB no longer has, so there is no fallback:
+    while the read DB is down this answers 503 right away.
+    """
+    rollups = await repo.get_buckets(
+        day_from.isoformat() if day_from else None,
+        day_to.isoformat() if day_to else None,
+    )
+    total = next(
+        (rollup for rollup in rollups if rollup.dimension == TOTAL),
+        VisitRollup(dimension=TOTAL),
+    )
+    return VisitReport(
+        total_visits=total.count,
+        closed_visits=total.closed_count,
+        open_visits=total.count - total.closed_count,
+        average_duration_minutes=_average_minutes(total),
+        by_destination=_buckets(rollups, DESTINATION),
+        by_visit_type=_buckets(rollups, VISIT_TYPE),
+        by_hour=_buckets(rollups, HOUR),
+        by_day=_buckets(rollups, DAY),
+    )
+
+
+@report_router.post("/visits/rebuild", response_model=RollupRebuild)
+def rebuild_visit_report(
+    visits: VisitRepository = Depends(VisitRepository),
+    rollups: VisitRollupRepository = Depends(VisitRollupRepository),
+):
+    """
+    Recompute the rollups from the visit read model with an aggregation
+    pipeline, plus the archived visits, for backfills or to repair drift.
+    The projectors of every worker wait until the new rollups are in place.
+    """
+    if not (visits.available and rollups.available):
+        raise ReadDBUnavailable()
+    start = time.perf_counter()
+    archived = (row_document(row) for row in visit_archive.iter_rows())
+    with projector.paused():
+        buckets = rebuild_rollups(
+            visits.collection, rollups.collection, archived
+        )
+    return RollupRebuild(
+        buckets=buckets,
+        elapsed_seconds=round(time.perf_counter() - start, 3),
+    )
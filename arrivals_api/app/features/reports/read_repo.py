@@ -0,0 +1,75 @@
+import logging
+from typing import List, Optional
+
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+
+from app.core.async_read_base_repository import AsyncReadRepository
+from app.core.read_base_repository import ReadRepository
+from app.core.read_db import ReadDBUnavailable, connection_lost
+from app.features.reports.rollups import DAY, ROLLUPS_COLLECTION
+from app.features.reports.schemas import VisitRollup
+
+logger = logging.getLogger(__name__)
+
+
+def bucket_query(
+    day_from: Optional[str] = None, day_to: Optional[str] = None
+) -> dict:
+    """
+    Every rollup bucket, with the day series limited to an inclusive
+    ``YYYY-MM-DD`` range.
+    """
+    if not (day_from or day_to):
+        return {}
+    day_range = {}
+    if day_from:
+        day_range["$gte"] = day_from
+    if day_to:
+        day_range["$lte"] = day_to
+    return {
+        "$or": [
+            {"dimension": {"$ne": DAY}},
+            {"dimension": DAY, "key": day_range},
+        ]
+    }
+
+
+class VisitRollupRepository(ReadRepository[VisitRollup]):
+    collection_name = ROLLUPS_COLLECTION
+    indexes = [IndexModel([("dimension", 1), ("key", 1)])]
+
+    def __init__(self):
+        super().__init__(self.collection_name, VisitRollup)
+
+    def get_buckets(
+        self, day_from: Optional[str] = None, day_to: Optional[str] = None
+    ) -> List[VisitRollup]:
+        """
+        Retrieve every rollup bucket; the day series can be limited to an
+        inclusive ``YYYY-MM-DD`` range.
+        """
+        self._check()
+        try:
+            documents = self.collection.find(bucket_query(day_from, day_to))
+            return [self.model(**doc) for doc in documents]
+        except PyMongoError as e:
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
+            logger.error("Error retrieving rollups: %s", e)
+            return []
+
+
+class AsyncVisitRollupRepository(AsyncReadRepository[VisitRollup]):
+    collection_name = ROLLUPS_COLLECTION
+
+    def __init__(self):
+        super().__init__(self.collection_name, VisitRollup)
+
+    async def get_buckets(
+        self, day_from: Optional[str] = None, day_to: Optional[str] = None
+    ) -> List[VisitRollup]:
+        return [
+            rollup
+            async for rollup in self.find(bucket_query(day_from, day_to))
+        ]
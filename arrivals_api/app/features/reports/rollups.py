@@ -0,0 +1,196 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+from app.core.read_indexes import index_registry
+
+ROLLUPS_COLLECTION = "visit_rollups"
+# Last projector batches applied to each bucket; a failed batch is written
+# again before the next one, so a few are enough
+APPLIED_BATCHES = 10
+
+TOTAL = "total"
+DESTINATION = "destination"
+VISIT_TYPE = "visit_type"
+HOUR = "hour"
+DAY = "day"
+
+
+def rollup_id(dimension: str, key) -> str:
+    return dimension if dimension == TOTAL else f"{dimension}:{key}"
+
+
+def _buckets(document: dict) -> List[Tuple[str, object, object]]:
+    entry_time = document["entry_time"]
+    return [
+        (TOTAL, None, None),
+        (
+            DESTINATION,
+            document["destination"]["id"],
+            document["destination"]["name"],
+        ),
+        (
+            VISIT_TYPE,
+            document["visit_type"]["id"],
+            document["visit_type"]["name"],
+        ),
+        (HOUR, entry_time.hour, f"{entry_time.hour:02d}:00"),
+        (DAY, entry_time.date().isoformat(), None),
+    ]
+
+
+def rollup_operations(
+    added: Iterable[dict] = (),
+    removed: Iterable[dict] = (),
+    batch: Optional[ObjectId] = None,
+) -> List[UpdateOne]:
+    """
+    Build ``$inc`` upserts that add the given visit documents to their
+    rollup buckets and take the removed ones out. Deltas are merged per
+    bucket, so a batch costs one operation per touched bucket.
+
+    With a projector ``batch`` the increments are applied at most once per
+    bucket: each bucket remembers the last batches it took. The buckets
+    are then upserted first and incremented after, so the operations must
+    be written in order.
+    """
+    increments: Dict[str, Dict[str, float]] = defaultdict(
+        lambda: defaultdict(int)
+    )
+    fields: Dict[str, dict] = {}
+
+    for sign, documents in ((1, added), (-1, removed)):
+        for document in documents:
+            duration = None
+            if document.get("exit_time") is not None:
+                duration = (
+                    document["exit_time"] - document["entry_time"]
+                ).total_seconds()
+
+            for dimension, key, label in _buckets(document):
+                id = rollup_id(dimension, key)
+                delta = increments[id]
+                delta["count"] += sign
+                if duration is not None:
+                    delta["closed_count"] += sign
+                    delta["duration_seconds"] += sign * duration
+
+                bucket = fields.setdefault(
+                    id, {"dimension": dimension, "key": key}
+                )
+                if label is not None and sign > 0:
+                    bucket["label"] = label
+
+    if batch is None:
+        return [
+            UpdateOne(
+                {"_id": id},
+                {"$inc": dict(increments[id]), "$set": fields[id]},
+                upsert=True,
+            )
+            for id in increments
+        ]
+    # A guarded upsert would collide with the bucket it skipped
+    return [
+        UpdateOne({"_id": id}, {"$set": fields[id]}, upsert=True)
+        for id in increments
+    ] + [
+        UpdateOne(
+            {"_id": id, "applied": {"$ne": batch}},
+            {
+                "$inc": dict(increments[id]),
+                "$push": {
+                    "applied": {"$each": [batch], "$slice": -APPLIED_BATCHES}
+                },
+            },
+        )
+        for id in increments
+    ]
+
+
+def rebuild_rollups(
+    visits: Collection,
+    rollups: Collection,
+    archived: Iterable[dict] = (),
+    batch_size: int = 5000,
+) -> int:
+    """
+    Recompute every rollup bucket from the visit documents with aggregation
+    pipelines, for backfills or to repair drift. Visits no longer in the
+    read DB (``archived`` documents) are added on top, ``batch_size`` at a
+    time. The buckets are built in a scratch collection that then replaces
+    ``rollups`` at once, so reports never see a partial set; the projector
+    must be paused meanwhile. Returns the bucket count.
+    """
+    closed = {"$ne": ["$exit_time", None]}
+    totals = {
+        "count": {"$sum": 1},
+        "closed_count": {"$sum": {"$cond": [closed, 1, 0]}},
+        "duration_ms": {
+            "$sum": {
+                "$cond": [
+                    closed,
+                    {"$subtract": ["$exit_time", "$entry_time"]},
+                    0,
+                ]
+            }
+        },
+    }
+    groupings = [
+        (TOTAL, None, None),
+        (DESTINATION, "$destination_id", "$destination.name"),
+        (VISIT_TYPE, "$visit_type_id", "$visit_type.name"),
+        (HOUR, {"$hour": "$entry_time"}, None),
+        (
+            DAY,
+            {"$dateToString": {"format": "%Y-%m-%d", "date": "$entry_time"}},
+            None,
+        ),
+    ]
+
+    documents = []
+    for dimension, key, label in groupings:
+        group = {"_id": key, **totals}
+        if label is not None:
+            group["label"] = {"$last": label}
+        for row in visits.aggregate([{"$group": group}], allowDiskUse=True):
+            document = {
+                "_id": rollup_id(dimension, row["_id"]),
+                "dimension": dimension,
+                "key": row["_id"],
+                "count": row["count"],
+                "closed_count": row["closed_count"],
+                "duration_seconds": row["duration_ms"] / 1000,
+            }
+            if label is not None:
+                document["label"] = row["label"]
+            elif dimension == HOUR:
+                document["label"] = f"{row['_id']:02d}:00"
+            documents.append(document)
+
+    scratch = rollups.database[f"{rollups.name}_rebuild"]
+    scratch.drop()
+    if documents:
+        scratch.insert_many(documents, ordered=False)
+
+    batch = []
+    for document in archived:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            scratch.bulk_write(rollup_operations(added=batch), ordered=False)
+            batch = []
+    if batch:
+        scratch.bulk_write(rollup_operations(added=batch), ordered=False)
+
+    indexes = index_registry.get(rollups.name)
+    if indexes:
+        scratch.create_indexes(indexes)
+    buckets = scratch.count_documents({})
+    if buckets:
+        scratch.rename(rollups.name, dropTarget=True)
+    else:
+        rollups.drop()
+    return buckets
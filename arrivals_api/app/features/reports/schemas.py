@@ -0,0 +1,35 @@
+from typing import List, Optional, Union
+
+from pydantic import BaseModel
+
+
+class VisitRollup(BaseModel):
+    dimension: str
+    key: Optional[Union[int, str]] = None
+    label: Optional[str] = None
+    count: int = 0
+    closed_count: int = 0
+    duration_seconds: float = 0.0
+
+
+class VisitBucket(BaseModel):
+    key: Union[int, str]
+    label: Optional[str] = None
+    visits: int
+    average_duration_minutes: Optional[float] = None
+
+
+class VisitReport(BaseModel):
+    total_visits: int
+    closed_visits: int
+    open_visits: int
+    average_duration_minutes: Optional[float] = None
+    by_destination: List[VisitBucket]
+    by_visit_type: List[VisitBucket]
+    by_hour: List[VisitBucket]
+    by_day: List[VisitBucket]
+
+
+class RollupRebuild(BaseModel):
+    buckets: int
+    elapsed_seconds: float
@@ -0,0 +1,98 @@
+from typing import List
+
+from fastapi import APIRouter, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.core.circuit_breaker import CLOSED
+from app.core.metrics import PROMETHEUS_MEDIA_TYPE, registry
+from app.core.pool_metrics import sqlalchemy_pool_stats
+from app.core.projector import projector
+from app.core.read_db import (
+    ReadDBUnavailable,
+    async_read_pool_metrics,
+    mongodb,
+    read_breaker,
+    read_pool_metrics,
+)
+from app.core.read_health import read_db_monitor
+from app.core.read_indexes import index_report
+from app.core.write_db import write_db
+from app.features.system.schemas import (
+    CacheStats,
+    EventFeedStats,
+    ExecutorStats,
+    HealthStatus,
+    IndexReport,
+    PoolStats,
+    ProjectionStats,
+    ReferenceCacheStats,
+)
+from app.features.users.auth import password_executor, token_cache
+from app.features.visits.events import visit_feed
+from app.features.visits.write_repo import destination_cache, visit_type_cache
+
+system_router = APIRouter(prefix="/system", tags=["System"])
+metrics_router = APIRouter(tags=["System"])
+
+
+@system_router.get("/password-hasher", response_model=ExecutorStats)
+async def password_hasher_stats():
+    return password_executor.stats()
+
+
+@system_router.get("/token-cache", response_model=CacheStats)
+async def token_cache_stats():
+    return token_cache.stats()
+
+
+@system_router.get("/projection", response_model=ProjectionStats)
+async def projection_stats():
+    return await run_in_threadpool(projector.lag)
+
+
+@system_router.get("/events", response_model=EventFeedStats)
+async def event_feed_stats():
+    return visit_feed.stats()
+
+
+@system_router.get(
+    "/reference-cache", response_model=List[ReferenceCacheStats]
+)
+async def reference_cache_stats():
+    return [visit_type_cache.stats(), destination_cache.stats()]
+
+
+@system_router.get("/health", response_model=HealthStatus)
+async def health():
+    """
+    ``degraded`` while the read DB circuit is open: read-model endpoints
+    are then served from the write DB, and reports answer 503.
+    """
+    read_db = read_db_monitor.stats()
+    status = "ok" if read_db["state"] == CLOSED else "degraded"
+    return {"status": status, "read_db": read_db}
+
+
+@system_router.get("/indexes", response_model=List[IndexReport])
+async def read_db_indexes():
+    if mongodb.database is None or read_breaker.state != CLOSED:
+        raise ReadDBUnavailable()
+    return await run_in_threadpool(index_report, mongodb.database)
+
+
+@system_router.get("/pools", response_model=List[PoolStats])
+async def connection_pool_stats():
+    return [
+        sqlalchemy_pool_stats(write_db.engine.pool),
+        sqlalchemy_pool_stats(write_db.async_engine.pool),
+        read_pool_metrics.stats(),
+        async_read_pool_metrics.stats(),
+    ]
+
+
+@metrics_router.get("/metrics", response_class=Response)
+async def metrics():
+    """
+    Request and database metrics in the Prometheus text format.
+    """
+    return Response(registry.render(), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ExecutorStats(BaseModel):
+    name: str
+    max_workers: int
+    queue_limit: int
+    running: int
+    queue_depth: int
+    submitted: int
+    completed: int
+    rejected: int
+    avg_wait_ms: float
+    avg_run_ms: float
+    max_latency_ms: float
+
+
+class CacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+
+
+class ProjectionStats(BaseModel):
+    running: bool
+    pending: int
+    oldest_pending_at: Optional[datetime] = None
+    lag_seconds: float
+    projected: int
+    batches: int
+    last_batch_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    failed: int
+
+
+class EventFeedStats(BaseModel):
+    name: str
+    subscribers: int
+    queue_size: int
+    published: int
+    delivered: int
+    dropped: int
+    slow_disconnects: int
+    last_id: int
+
+
+class ReadDBHealth(BaseModel):
+    name: str
+    state: str
+    recent_failures: int
+    opened_at: Optional[datetime] = None
+    trips: int
+    rejected: int
+    last_error: Optional[str] = None
+    last_check_at: Optional[datetime] = None
+    last_ok_at: Optional[datetime] = None
+    ping_ms: Optional[float] = None
+
+
+class HealthStatus(BaseModel):
+    status: str
+    read_db: ReadDBHealth
+
+
+class ReferenceCacheStats(BaseModel):
+    name: str
+    size: int
+    version: int
+    hits: int
+    misses: int
+    loads: int
+    age_seconds: Optional[float] = None
+
+
+class IndexReport(BaseModel):
+    collection: str
+    declared: List[str]
+    missing: List[str]
+    undeclared: List[str]
+    unused: Optional[List[str]] = None
+
+
+class PoolStats(BaseModel):
+    name: str
+    max_size: Optional[int] = None
+    checked_out: int
+    overflow: Optional[int] = None
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-
-from app.features.users.auth import AuthService, hash_password
+from fastapi import APIRouter, Depends, HTTPException, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.core.read_db import (
+    READ_SOURCE_HEADER,
+    WRITE_DB_SOURCE,
+    ReadDBUnavailable,
+)
+from app.features.users.auth import AuthService, hash_password_async
 from app.features.users.models import User as UserModel
-from app.features.users.read_repo import MongoUser
+from app.features.users.read_repo import AsyncMongoUser
 from app.features.users.schemas import UserCreate, UserLogin, UserOut
 from app.features.users.write_repo import UserRepository
 
@@ -12,18 +18,17 @@ auth_router = APIRouter()
 
 
 @user_router.post("/", response_model=UserOut)
-def create_user(
+async def create_user(
     user: UserCreate,
     repo: UserRepository = Depends(UserRepository),
-    mongo: MongoUser = Depends(MongoUser),
 ):
-    db_user = repo.get_user_by_username(user.username)
+    db_user = await run_in_threadpool(repo.get_user_by_username, user.username)
     if db_user:
         raise HTTPException(
             status_code=400, detail="Username already registered"
         )
 
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password_async(user.password)
     new_user = UserModel(
         username=user.username,
         email=user.email,
@@ -31,8 +36,8 @@ def create_user(
         hashed_password=hashed_password,
     )
 
-    new_user = repo.create(new_user)
-    mongo.insert_one(new_user.__dict__)
+    # The read model is updated by the projector from the outbox
+    new_user = await run_in_threadpool(repo.create, new_user)
 
     return new_user
 
@@ -48,23 +53,32 @@ def get_user(
     return db_user
 
 
-@user_router.get("mongo/{username}", response_model=UserOut)
-def get_mongo_user(
+@user_router.get("/mongo/{username}", response_model=UserOut)
+async def get_mongo_user(
     username: str,
-    mongo: MongoUser = Depends(MongoUser),
+    response: Response,
+    mongo: AsyncMongoUser = Depends(AsyncMongoUser),
+    repo: UserRepository = Depends(UserRepository),
 ):
-    db_user = mongo.get_user_by_username(username)
+    try:
+        db_user = await mongo.get_user_by_username(username)
+    except ReadDBUnavailable:
+        # Degraded read from the write DB while the read DB is down
+        db_user = await run_in_threadpool(repo.get_user_by_username, username)
+        response.headers[READ_SOURCE_HEADER] = WRITE_DB_SOURCE
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
 
 
 @auth_router.post("/login")
-def login(
+async def login(
     user: UserLogin,
     auth_service: AuthService = Depends(AuthService),
 ):
-    db_user = auth_service.authenticate_user(user.username, user.password)
+    db_user = await auth_service.authenticate_user(
+        user.username, user.password
+    )
 
     if not db_user:
         raise HTTPException(
@@ -1,11 +1,15 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Optional
 
 from fastapi import Depends
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+from app.core.worker_pool import BoundedExecutor
 
 if TYPE_CHECKING:
     from app.features.users.models import User
@@ -15,11 +19,34 @@ from app.features.users.write_repo import UserRepository
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a thread pool keeps hashing off the event loop
+password_executor = BoundedExecutor(
+    "password-hash",
+    max_workers=settings.password_hash_workers,
+    queue_limit=settings.password_hash_queue_limit,
+)
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def hash_password_async(password: str) -> str:
+    return await password_executor.run(hash_password, password)
+
+
+# Decoded claims of already verified tokens, kept until each token's exp
+token_cache: TTLCache[dict] = TTLCache(maxsize=settings.token_cache_size)
+
+
+def invalidate_token_cache() -> None:
+    """
+    Drop every cached token. Call it when the signing key is rotated or
+    tokens are revoked.
+    """
+    token_cache.invalidate()
+
+
 class AuthService:
 
     def __init__(self, user_repo: UserRepository = Depends(UserRepository)):
@@ -35,18 +62,35 @@ class AuthService:
     ) -> bool:
         return pwd_context.verify(plain_password, hashed_password)
 
-    def authenticate_user(
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        return await password_executor.run(
+            self.verify_password, plain_password, hashed_password
+        )
+
+    async def authenticate_user(
         self, username: str, password: str
     ) -> Optional["User"]:
         """
         Validate the user credentials.
         Returns user data if valid, None otherwise.
         """
-        user = self._user_repo.get_user_by_username(username)
-        if user and self.verify_password(password, user.hashed_password):
+        user = await run_in_threadpool(self._get_user, username)
+        if user and await self.verify_password_async(
+            password, user.hashed_password
+        ):
             return user
         return None
 
+    def _get_user(self, username: str) -> Optional["User"]:
+        # Hand the connection back to the pool before the slow password
+        # check; the loaded user stays readable once detached
+        try:
+            return self._user_repo.get_user_by_username(username)
+        finally:
+            self._user_repo.db.close()
+
     def create_access_token(self, data: dict) -> str:
         to_encode = data.copy()
         expire = datetime.now(timezone.utc) + (
@@ -58,10 +102,25 @@ class AuthService:
         )
 
     def verify_access_token(self, token: str) -> Optional[dict]:
+        cache_key = self._token_cache_key(token)
+        payload = token_cache.get(cache_key)
+        if payload is not None:
+            return dict(payload)
+
         try:
             payload = jwt.decode(
                 token, self._secret_key, algorithms=[self._algorithm]
             )
-            return payload
         except JWTError:
             return None
+
+        if "exp" in payload:
+            token_cache.set(cache_key, payload, float(payload["exp"]))
+        return dict(payload)
+
+    def _token_cache_key(self, token: str) -> str:
+        # The key material is part of the digest, so tokens verified with a
+        # previous secret or algorithm never hit after a rotation.
+        return hashlib.sha256(
+            f"{self._algorithm}:{self._secret_key}:{token}".encode()
+        ).hexdigest()
@@ -0,0 +1,29 @@
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.projector import Projection
+from app.features.users.models import User
+
+
+class UserProjection(Projection):
+    aggregate = "users"
+    collection = "users"
+
+    def load(self, db: Session, ids: List[int]) -> List[dict]:
+        rows = db.execute(
+            select(User.id, User.username, User.email, User.full_name).where(
+                User.id.in_(ids)
+            )
+        )
+        return [
+            {
+                "_id": row.id,
+                "id": row.id,
+                "username": row.username,
+                "email": row.email,
+                "full_name": row.full_name,
+            }
+            for row in rows
+        ]
@@ -1,21 +1,28 @@
 from typing import Optional
 
-from pymongo.errors import PyMongoError
+from pymongo import IndexModel
 
+from app.core.async_read_base_repository import AsyncReadRepository
 from app.core.read_base_repository import ReadRepository
 from app.features.users.schemas import UserOut
 
 
 class MongoUser(ReadRepository[UserOut]):
+    collection_name = "users"
+    indexes = [IndexModel("username", unique=True)]
+
     def __init__(self):
-        super().__init__("users", UserOut)
+        super().__init__(self.collection_name, UserOut)
 
     def get_user_by_username(self, username: str) -> Optional[UserOut]:
-        try:
-            user_data = self.collection.find_one({"username": username})
-            if user_data:
-                return UserOut(**user_data)
-            return None
-        except PyMongoError as e:
-            print(f"Error finding user by username: {e}")
-            return None
+        return self.find_by_field("username", username)
+
+
+class AsyncMongoUser(AsyncReadRepository[UserOut]):
+    collection_name = MongoUser.collection_name
+
+    def __init__(self):
+        super().__init__(self.collection_name, UserOut)
+
+    async def get_user_by_username(self, username: str) -> Optional[UserOut]:
+        return await self.find_one({"username": username})
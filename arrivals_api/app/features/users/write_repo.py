@@ -7,6 +7,8 @@ from app.features.users.models import User
 
 
 class UserRepository(BaseRepository[User]):
+    aggregate = "users"
+
     def __init__(self, db: Session = Depends(get_db)):
         super().__init__(User, db)
 
@@ -1,18 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-
+from datetime import date, timedelta
+from typing import List, Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.etag import ETagCheck
+from app.core.pagination import (
+    MAX_PAGE_SIZE,
+    PageParams,
+    ndjson_response,
+    set_next_cursor,
+)
+from app.core.read_base_repository import list_adapter
+from app.core.read_db import (
+    READ_SOURCE_HEADER,
+    WRITE_DB_SOURCE,
+    ReadDBUnavailable,
+)
+from app.core.serialization import JSONBytesResponse, dump_json
+from app.core.write_db import get_db
+from app.features.visits import read_repo
+from app.features.visits.archive import VisitArchiver, visit_archive
+from app.features.visits.batch import VisitBatch
+from app.features.visits.events import (
+    VisitEvents,
+    parse_event_id,
+    sse_stream,
+)
+from app.features.visits.export import (
+    CSV,
+    EXPORT_BATCH_ROWS,
+    MEDIA_TYPES,
+    csv_chunks,
+    document_row,
+    entry_time_range,
+    iter_write_rows,
+    parquet_chunks,
+)
+from app.features.visits.filters import VisitFilters
+from app.features.visits.models import Destination, Visit, VisitType
 from app.features.visits.schemas import (
+    MAX_BATCH_SIZE,
+    ArchiveReport,
+    BatchResult,
+    DestinationCreate,
+    DestinationOut,
+    SeedReport,
+    VisitArchiveRequest,
     VisitCreate,
+    VisitGenerate,
     VisitOut,
+    VisitPatch,
     VisitTypeCreate,
     VisitTypeOut,
-    DestinationCreate,
-    DestinationOut,
+    VisitUpdate,
 )
+from app.features.visits.seed import build_seeder
+from app.features.visits.serializers import VisitSerializer
 from app.features.visits.write_repo import (
+    DestinationRepository,
     VisitRepository,
     VisitTypeRepository,
-    DestinationRepository,
 )
 
 # Routers
@@ -26,28 +84,295 @@ destination_router = APIRouter(prefix="/destinations", tags=["Destinations"])
 async def create_visit(
     visit: VisitCreate,
     repo: VisitRepository = Depends(VisitRepository),
+    batch: VisitBatch = Depends(VisitBatch),
+    events: VisitEvents = Depends(VisitEvents),
 ):
-    new_visit = repo.create(visit)
+    data = visit.model_dump()
+    error = await batch.check(data)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    try:
+        new_visit = await repo.create(Visit(**data))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await events.created([new_visit])
     return new_visit
 
 
+@visit_router.post("/generate", response_model=SeedReport, status_code=201)
+def generate_visits(
+    params: VisitGenerate,
+    db: Session = Depends(get_db),
+):
+    # Plain def: the bulk load is blocking, so FastAPI runs it in a thread
+    seeder = build_seeder(db, params.batch_size, params.seed)
+    return seeder.run(params.count)
+
+
+@visit_router.post("/archive", response_model=ArchiveReport)
+def archive_visits(
+    params: VisitArchiveRequest = Body(VisitArchiveRequest()),
+    db: Session = Depends(get_db),
+):
+    """
+    Move closed visits that left more than ``older_than_days`` ago out of
+    the write and read DBs into the archive segments. Exports and reports
+    keep including them.
+    """
+    days = params.older_than_days
+    if days is None:
+        days = settings.archive_after_days
+    archiver = VisitArchiver(db, visit_archive, settings.archive_batch_size)
+    return archiver.run(timedelta(days=days))
+
+
+@visit_router.post("/batch", response_model=BatchResult)
+async def create_visits_batch(
+    visits: List[VisitCreate] = Body(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE
+    ),
+    batch: VisitBatch = Depends(VisitBatch),
+):
+    """
+    Register a burst of arrivals in one transaction. Each item gets its own
+    result; items with unknown references are skipped.
+    """
+    try:
+        return await batch.create(visits)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@visit_router.patch("/batch", response_model=BatchResult)
+async def update_visits_batch(
+    visits: List[VisitPatch] = Body(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE
+    ),
+    batch: VisitBatch = Depends(VisitBatch),
+):
+    """
+    Partially update many visits (e.g. set their exit time) in one
+    transaction. Only the fields sent for an item are changed.
+    """
+    try:
+        return await batch.update(visits)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@visit_router.delete("/batch", response_model=BatchResult)
+async def delete_visits_batch(
+    ids: List[int] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    batch: VisitBatch = Depends(VisitBatch),
+):
+    try:
+        return await batch.delete(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @visit_router.get("/", response_model=List[VisitOut])
 async def list_visits(
+    response: Response,
+    page: PageParams = Depends(),
+    filters: VisitFilters = Depends(),
+    etag: str = Depends(ETagCheck("visits")),
     repo: VisitRepository = Depends(VisitRepository),
+    serializer: VisitSerializer = Depends(VisitSerializer),
+):
+    # References come from the cache, so the visits are read without joins
+    criteria = filters.sql_criteria()
+    if page.stream:
+        visits = repo.stream(page.after_id, options=(), criteria=criteria)
+        return ndjson_response(serializer.stream(visits), VisitOut, etag)
+    visits = await repo.get_all(
+        page.after_id, page.limit, options=(), criteria=criteria
+    )
+    set_next_cursor(response, visits, page.limit)
+    return await serializer.serialize_many(visits)
+
+
+@visit_router.get("/export", response_class=StreamingResponse)
+def export_visits(
+    format: Literal["csv", "parquet"] = CSV,
+    day_from: Optional[date] = Query(None, alias="from"),
+    day_to: Optional[date] = Query(None, alias="to"),
+    repo: read_repo.VisitRepository = Depends(read_repo.VisitRepository),
 ):
-    visits = repo.get_all()
-    return visits
+    """
+    Full visit history by entry day (``from`` and ``to`` inclusive),
+    streamed from a read DB cursor merged with the archived visits, and
+    encoded as chunked CSV or as Parquet row groups, so memory stays flat
+    whatever the range. While the read DB is down the visits are streamed
+    from the write DB instead.
+    """
+    entry_from, entry_to = entry_time_range(day_from, day_to)
+    headers = {
+        "Content-Disposition": f'attachment; filename="visits.{format}"'
+    }
+    if repo.available:
+        documents = repo.iter_entry_range(
+            entry_from, entry_to, batch_size=EXPORT_BATCH_ROWS
+        )
+        hot = (document_row(document) for document in documents)
+    else:
+        hot = iter_write_rows(entry_from, entry_to)
+        headers[READ_SOURCE_HEADER] = WRITE_DB_SOURCE
+    rows = visit_archive.merge(hot, entry_from, entry_to)
+    body = csv_chunks(rows) if format == CSV else parquet_chunks(rows)
+    return StreamingResponse(
+        body, media_type=MEDIA_TYPES[format], headers=headers
+    )
+
+
+@visit_router.get("/open", response_model=List[VisitOut])
+async def list_open_visits(
+    etag: str = Depends(ETagCheck("visits")),
+    destination_id: Optional[int] = None,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    repo: VisitRepository = Depends(VisitRepository),
+    serializer: VisitSerializer = Depends(VisitSerializer),
+):
+    """
+    Visitors currently on site, optionally at a single destination.
+    """
+    visits = await repo.get_open(destination_id, limit)
+    return await serializer.serialize_many(visits)
+
+
+@visit_router.get("/events", response_class=StreamingResponse)
+async def stream_visit_events(
+    destination_id: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Server-Sent Events feed of arrivals (``visit_created``) and departures
+    (``visit_exited``), optionally at a single destination. Each event
+    carries the visit as ``data``; a reconnecting client resumes after its
+    ``Last-Event-ID`` while that event is still kept. Events are pushed by
+    the write endpoints of this worker, so an idle subscriber costs no
+    database work.
+    """
+    return StreamingResponse(
+        sse_stream(
+            destination_id,
+            parse_event_id(last_event_id),
+            settings.events_keepalive_seconds,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@visit_router.get(
+    "/mongo/",
+    response_model=List[VisitOut],
+    response_class=JSONBytesResponse,
+)
+async def list_visits_from_read_db(
+    page: PageParams = Depends(),
+    filters: VisitFilters = Depends(),
+    etag: str = Depends(ETagCheck("visits", read_model=True)),
+    repo: read_repo.AsyncVisitRepository = Depends(
+        read_repo.AsyncVisitRepository
+    ),
+    visits: VisitRepository = Depends(VisitRepository),
+    serializer: VisitSerializer = Depends(VisitSerializer),
+):
+    """
+    Visits page served from the read model. The projected documents already
+    have the ``VisitOut`` shape, so they are encoded as they come instead of
+    being validated into models and checked again against the response
+    model. While the read DB is down the page comes from the write DB.
+    """
+    if not repo.available:
+        return await _visits_from_write_db(
+            page, filters, etag, visits, serializer
+        )
+    query = filters.mongo_query()
+    if page.stream:
+        stream = repo.stream(page.after_id, query=query)
+        return ndjson_response(stream, VisitOut, etag)
+    try:
+        documents = await repo.get_all_raw(page.after_id, page.limit, query)
+    except ReadDBUnavailable:
+        return await _visits_from_write_db(
+            page, filters, etag, visits, serializer
+        )
+    response = JSONBytesResponse(
+        dump_json(documents),
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
+    set_next_cursor(response, documents, page.limit)
+    return response
+
+
+async def _visits_from_write_db(
+    page: PageParams,
+    filters: VisitFilters,
+    etag: str,
+    repo: VisitRepository,
+    serializer: VisitSerializer,
+) -> Response:
+    # Degraded read: same page from the write DB while the read DB is down
+    headers = {READ_SOURCE_HEADER: WRITE_DB_SOURCE}
+    criteria = filters.sql_criteria()
+    if page.stream:
+        stream = repo.stream(page.after_id, options=(), criteria=criteria)
+        response = ndjson_response(serializer.stream(stream), VisitOut, etag)
+        response.headers.update(headers)
+        return response
+    visits = await serializer.serialize_many(
+        await repo.get_all(
+            page.after_id, page.limit, options=(), criteria=criteria
+        )
+    )
+    response = JSONBytesResponse(
+        list_adapter(VisitOut).dump_json(visits),
+        headers={"ETag": etag, "Cache-Control": "no-cache", **headers},
+    )
+    set_next_cursor(response, visits, page.limit)
+    return response
+
+
+@visit_router.get(
+    "/mongo/{visit_id}",
+    response_model=VisitOut,
+    response_class=JSONBytesResponse,
+)
+async def get_visit_from_read_db(
+    visit_id: int,
+    repo: read_repo.AsyncVisitRepository = Depends(
+        read_repo.AsyncVisitRepository
+    ),
+    visits: VisitRepository = Depends(VisitRepository),
+    serializer: VisitSerializer = Depends(VisitSerializer),
+):
+    try:
+        document = await repo.get_raw_by_id(visit_id)
+    except ReadDBUnavailable:
+        visit = await visits.get(visit_id, options=())
+        if not visit:
+            raise HTTPException(status_code=404, detail="Visit not found")
+        return JSONBytesResponse(
+            (await serializer.serialize(visit)).model_dump_json().encode(),
+            headers={READ_SOURCE_HEADER: WRITE_DB_SOURCE},
+        )
+    if not document:
+        raise HTTPException(status_code=404, detail="Visit not found")
+    return JSONBytesResponse(dump_json(document))
 
 
 @visit_router.get("/{visit_id}", response_model=VisitOut)
 async def get_visit(
     visit_id: int,
     repo: VisitRepository = Depends(VisitRepository),
+    serializer: VisitSerializer = Depends(VisitSerializer),
 ):
-    visit = repo.get(visit_id)
+    visit = await repo.get(visit_id, options=())
     if not visit:
         raise HTTPException(status_code=404, detail="Visit not found")
-    return visit
+    return await serializer.serialize(visit)
 
 
 @visit_router.put("/{visit_id}", response_model=VisitOut)
@@ -55,12 +380,59 @@ async def update_visit(
     visit_id: int,
     visit: VisitCreate,
     repo: VisitRepository = Depends(VisitRepository),
+    batch: VisitBatch = Depends(VisitBatch),
+    serializer: VisitSerializer = Depends(VisitSerializer),
+    events: VisitEvents = Depends(VisitEvents),
 ):
-    existing_visit = repo.get(visit_id)
-    if not existing_visit:
+    return await _update_visit(
+        visit_id, visit.model_dump(), repo, batch, serializer, events
+    )
+
+
+@visit_router.patch("/{visit_id}", response_model=VisitOut)
+async def patch_visit(
+    visit_id: int,
+    visit: VisitUpdate,
+    repo: VisitRepository = Depends(VisitRepository),
+    batch: VisitBatch = Depends(VisitBatch),
+    serializer: VisitSerializer = Depends(VisitSerializer),
+    events: VisitEvents = Depends(VisitEvents),
+):
+    """
+    Change only the fields that are sent, e.g. ``{"exit_time": ...}`` when
+    the visitor leaves.
+    """
+    return await _update_visit(
+        visit_id,
+        visit.model_dump(exclude_unset=True),
+        repo,
+        batch,
+        serializer,
+        events,
+    )
+
+
+async def _update_visit(
+    visit_id: int,
+    changes: dict,
+    repo: VisitRepository,
+    batch: VisitBatch,
+    serializer: VisitSerializer,
+    events: VisitEvents,
+) -> VisitOut:
+    # References are checked against the caches, then a single UPDATE
+    error = await batch.check(changes)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    try:
+        visit = await repo.update_by_id(visit_id, changes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not visit:
         raise HTTPException(status_code=404, detail="Visit not found")
-    updated_visit = repo.update(existing_visit, visit.dict())
-    return updated_visit
+    if changes.get("exit_time") is not None:
+        await events.exited([visit])
+    return await serializer.serialize(visit)
 
 
 @visit_router.delete("/{visit_id}", status_code=204)
@@ -68,10 +440,8 @@ async def delete_visit(
     visit_id: int,
     repo: VisitRepository = Depends(VisitRepository),
 ):
-    visit = repo.get(visit_id)
-    if not visit:
+    if not await repo.delete_by_id(visit_id):
         raise HTTPException(status_code=404, detail="Visit not found")
-    repo.delete(visit_id)
 
 
 # VisitType Endpoints
@@ -80,15 +450,26 @@ async def create_visit_type(
     visit_type: VisitTypeCreate,
     repo: VisitTypeRepository = Depends(VisitTypeRepository),
 ):
-    new_visit_type = repo.create(visit_type)
+    try:
+        new_visit_type = await repo.create(
+            VisitType(**visit_type.model_dump())
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return new_visit_type
 
 
 @visit_type_router.get("/", response_model=List[VisitTypeOut])
 async def list_visit_types(
+    response: Response,
+    page: PageParams = Depends(),
+    etag: str = Depends(ETagCheck("visit_types")),
     repo: VisitTypeRepository = Depends(VisitTypeRepository),
 ):
-    visit_types = repo.get_all()
+    if page.stream:
+        return ndjson_response(repo.stream(page.after_id), VisitTypeOut, etag)
+    visit_types = await repo.get_all_cached(page.after_id, page.limit)
+    set_next_cursor(response, visit_types, page.limit)
     return visit_types
 
 
@@ -97,7 +478,7 @@ async def get_visit_type(
     visit_type_id: int,
     repo: VisitTypeRepository = Depends(VisitTypeRepository),
 ):
-    visit_type = repo.get(visit_type_id)
+    visit_type = await repo.get_cached(visit_type_id)
     if not visit_type:
         raise HTTPException(status_code=404, detail="Visit type not found")
     return visit_type
@@ -109,10 +490,14 @@ async def update_visit_type(
     visit_type: VisitTypeCreate,
     repo: VisitTypeRepository = Depends(VisitTypeRepository),
 ):
-    existing_visit_type = repo.get(visit_type_id)
-    if not existing_visit_type:
+    try:
+        updated_visit_type = await repo.update_by_id(
+            visit_type_id, visit_type.model_dump()
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not updated_visit_type:
         raise HTTPException(status_code=404, detail="Visit type not found")
-    updated_visit_type = repo.update(existing_visit_type, visit_type.dict())
     return updated_visit_type
 
 
@@ -121,10 +506,12 @@ async def delete_visit_type(
     visit_type_id: int,
     repo: VisitTypeRepository = Depends(VisitTypeRepository),
 ):
-    visit_type = repo.get(visit_type_id)
-    if not visit_type:
+    try:
+        deleted = await repo.delete_by_id(visit_type_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Visit type not found")
-    repo.delete(visit_type_id)
 
 
 # Destination Endpoints
@@ -133,15 +520,28 @@ async def create_destination(
     destination: DestinationCreate,
     repo: DestinationRepository = Depends(DestinationRepository),
 ):
-    new_destination = repo.create(destination)
+    try:
+        new_destination = await repo.create(
+            Destination(**destination.model_dump())
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return new_destination
 
 
 @destination_router.get("/", response_model=List[DestinationOut])
 async def list_destinations(
+    response: Response,
+    page: PageParams = Depends(),
+    etag: str = Depends(ETagCheck("destinations")),
     repo: DestinationRepository = Depends(DestinationRepository),
 ):
-    destinations = repo.get_all()
+    if page.stream:
+        return ndjson_response(
+            repo.stream(page.after_id), DestinationOut, etag
+        )
+    destinations = await repo.get_all_cached(page.after_id, page.limit)
+    set_next_cursor(response, destinations, page.limit)
     return destinations
 
 
@@ -150,7 +550,7 @@ async def get_destination(
     destination_id: int,
     repo: DestinationRepository = Depends(DestinationRepository),
 ):
-    destination = repo.get(destination_id)
+    destination = await repo.get_cached(destination_id)
     if not destination:
         raise HTTPException(status_code=404, detail="Destination not found")
     return destination
@@ -162,10 +562,14 @@ async def update_destination(
     destination: DestinationCreate,
     repo: DestinationRepository = Depends(DestinationRepository),
 ):
-    existing_destination = repo.get(destination_id)
-    if not existing_destination:
+    try:
+        updated_destination = await repo.update_by_id(
+            destination_id, destination.model_dump()
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not updated_destination:
         raise HTTPException(status_code=404, detail="Destination not found")
-    updated_destination = repo.update(existing_destination, destination.dict())
     return updated_destination
 
 
@@ -174,7 +578,9 @@ async def delete_destination(
     destination_id: int,
     repo: DestinationRepository = Depends(DestinationRepository),
 ):
-    destination = repo.get(destination_id)
-    if not destination:
+    try:
+        deleted = await repo.delete_by_id(destination_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Destination not found")
-    repo.delete(destination_id)
@@ -0,0 +1,310 @@
+import argparse
+import glob
+import heapq
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.etag import collection_versions
+from app.core.outbox import ARCHIVE, OutboxEvent, event_rows
+from app.core.projector import projector
+from app.features.visits.export import (
+    EXPORT_BATCH_ROWS,
+    export_query,
+    parquet_schema,
+    record_batch,
+)
+from app.features.visits.models import Visit
+from app.features.visits.schemas import ArchiveReport
+
+SEGMENT_SUFFIX = ".parquet"
+# Written but not yet removed from the write DB
+PENDING_SUFFIX = ".pending"
+MONTH_FORMAT = "%Y-%m"
+
+
+def row_order(row: tuple) -> Tuple[datetime, int]:
+    """
+    Sort key of an export row: entry time, then id. The read DB keeps
+    milliseconds, so microseconds are dropped for hot and archived rows to
+    sort (and compare) alike.
+    """
+    entry_time = row[7]
+    return (
+        entry_time.replace(microsecond=entry_time.microsecond // 1000 * 1000),
+        row[0],
+    )
+
+
+class VisitArchive:
+    """
+    Closed visits moved out of the write DB, stored as zstd compressed
+    Parquet segments with the export columns. Segments are partitioned by
+    entry month (one directory per month) and sorted by ``row_order``.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def write(self, rows: List[tuple]) -> List[str]:
+        """
+        Write ``rows`` as pending segments, one per entry month, flushed to
+        disk. They are only read once ``publish`` renames them.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        by_month = defaultdict(list)
+        for row in rows:
+            by_month[row[7].strftime(MONTH_FORMAT)].append(row)
+
+        schema = parquet_schema()
+        paths = []
+        for month, month_rows in sorted(by_month.items()):
+            month_rows.sort(key=row_order)
+            ids = [row[0] for row in month_rows]
+            directory = os.path.join(self.directory, month)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(
+                directory,
+                f"visits-{min(ids)}-{max(ids)}{SEGMENT_SUFFIX}"
+                f"{PENDING_SUFFIX}",
+            )
+            table = pa.Table.from_batches([record_batch(month_rows, schema)])
+            pq.write_table(
+                table,
+                path,
+                compression="zstd",
+                row_group_size=EXPORT_BATCH_ROWS,
+            )
+            with open(path, "rb") as f:
+                os.fsync(f.fileno())
+            paths.append(path)
+        return paths
+
+    def publish(self, paths: Iterable[str]) -> List[str]:
+        published = []
+        for path in paths:
+            segment = path[: -len(PENDING_SUFFIX)]
+            os.replace(path, segment)
+            published.append(segment)
+        return published
+
+    def discard(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            os.remove(path)
+
+    def pending(self) -> List[str]:
+        return sorted(
+            glob.glob(
+                os.path.join(
+                    self.directory, "*", f"*{SEGMENT_SUFFIX}{PENDING_SUFFIX}"
+                )
+            )
+        )
+
+    @staticmethod
+    def segment_ids(path: str) -> List[int]:
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, columns=["id"]).column("id").to_pylist()
+
+    def iter_rows(
+        self,
+        entry_from: Optional[datetime] = None,
+        entry_to: Optional[datetime] = None,
+    ) -> Iterator[tuple]:
+        """
+        Archived rows with ``entry_from <= entry_time < entry_to`` in
+        ``row_order``. Only the segments of the months in range are opened,
+        one row group at a time.
+        """
+        return heapq.merge(
+            *(
+                self._iter_segment(path, entry_from, entry_to)
+                for path in self._segments(entry_from, entry_to)
+            ),
+            key=row_order,
+        )
+
+    def merge(
+        self,
+        rows: Iterable[tuple],
+        entry_from: Optional[datetime] = None,
+        entry_to: Optional[datetime] = None,
+    ) -> Iterator[tuple]:
+        """
+        Merge hot rows, already in ``row_order``, with the archived rows of
+        the same range. A visit archived but not yet removed from the read
+        DB is yielded once.
+        """
+        last = None
+        for row in heapq.merge(
+            rows, self.iter_rows(entry_from, entry_to), key=row_order
+        ):
+            key = row_order(row)
+            if key != last:
+                yield row
+            last = key
+
+    def _segments(
+        self, entry_from: Optional[datetime], entry_to: Optional[datetime]
+    ) -> List[str]:
+        first = entry_from.strftime(MONTH_FORMAT) if entry_from else None
+        last = (
+            (entry_to - timedelta(microseconds=1)).strftime(MONTH_FORMAT)
+            if entry_to
+            else None
+        )
+        paths = []
+        for directory in sorted(glob.glob(os.path.join(self.directory, "*"))):
+            month = os.path.basename(directory)
+            if (first and month < first) or (last and month > last):
+                continue
+            paths.extend(
+                sorted(
+                    glob.glob(os.path.join(directory, f"*{SEGMENT_SUFFIX}"))
+                )
+            )
+        return paths
+
+    @staticmethod
+    def _iter_segment(
+        path: str,
+        entry_from: Optional[datetime],
+        entry_to: Optional[datetime],
+    ) -> Iterator[tuple]:
+        import pyarrow.parquet as pq
+
+        segment = pq.ParquetFile(path)
+        for batch in segment.iter_batches(batch_size=EXPORT_BATCH_ROWS):
+            columns = [column.to_pylist() for column in batch.columns]
+            for row in zip(*columns):
+                if entry_from is not None and row[7] < entry_from:
+                    continue
+                if entry_to is not None and row[7] >= entry_to:
+                    return
+                yield row
+
+
+class VisitArchiver:
+    """
+    Moves closed visits that left before a cutoff from the write DB into a
+    ``VisitArchive``, ``batch_size`` visits at a time. Each batch is
+    written as pending segments, then deleted from ``visits`` in the same
+    transaction as its outbox events, and only then published. A crash in
+    between is settled by ``recover`` on the next run.
+    """
+
+    def __init__(
+        self, db: Session, archive: VisitArchive, batch_size: int = 5000
+    ):
+        self.db = db
+        self.archive = archive
+        self.batch_size = batch_size
+
+    def run(self, older_than: timedelta) -> ArchiveReport:
+        start = time.perf_counter()
+        self.recover()
+
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - older_than
+        archived = 0
+        segments = []
+        while True:
+            rows = self._closed_before(cutoff)
+            if not rows:
+                break
+            segments.extend(self._archive_batch(rows))
+            archived += len(rows)
+
+        return ArchiveReport(
+            cutoff=cutoff,
+            visits=archived,
+            segments=segments,
+            elapsed_seconds=round(time.perf_counter() - start, 3),
+        )
+
+    def recover(self) -> None:
+        """
+        Settle segments left pending by an interrupted run: publish them if
+        their visits are gone from the write DB, drop them otherwise.
+        """
+        for path in self.archive.pending():
+            ids = self.archive.segment_ids(path)
+            still_hot = self.db.scalar(
+                select(func.count()).where(Visit.id.in_(ids))
+            )
+            if still_hot:
+                self.archive.discard([path])
+            else:
+                self.archive.publish([path])
+
+    def _archive_batch(self, rows: List[tuple]) -> List[str]:
+        paths = self.archive.write(rows)
+        ids = [row[0] for row in rows]
+        try:
+            self.db.execute(delete(Visit).where(Visit.id.in_(ids)))
+            # Removes the read documents; the rollups keep counting them
+            self.db.execute(
+                insert(OutboxEvent), event_rows("visits", ids, ARCHIVE)
+            )
+            self.db.execute(collection_versions.bump("visits"))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self.archive.discard(paths)
+            raise
+
+        projector.notify(len(ids))
+        return self.archive.publish(paths)
+
+    def _closed_before(self, cutoff: datetime) -> List[tuple]:
+        result = self.db.execute(
+            export_query()
+            .where(Visit.exit_time < cutoff)
+            .order_by(Visit.id)
+            .limit(self.batch_size)
+        )
+        return [tuple(row) for row in result]
+
+
+visit_archive = VisitArchive(settings.archive_dir)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from app.core.write_db import SessionLocal
+
+    parser = argparse.ArgumentParser(
+        description="Move old closed visits into the archive segments."
+    )
+    parser.add_argument(
+        "--older-than-days", type=int, default=settings.archive_after_days
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.archive_batch_size
+    )
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        report = VisitArchiver(db, visit_archive, args.batch_size).run(
+            timedelta(days=args.older_than_days)
+        )
+    finally:
+        db.close()
+
+    print(
+        f"Archived {report.visits} visits that left before "
+        f"{report.cutoff:%Y-%m-%d} into {len(report.segments)} segments "
+        f"in {report.elapsed_seconds}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
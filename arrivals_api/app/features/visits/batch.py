@@ -0,0 +1,187 @@
+from typing import Dict, List, Optional
+
+from fastapi import Depends
+
+from app.features.visits.events import VisitEvents
+from app.features.visits.models import Visit
+from app.features.visits.schemas import (
+    BatchItemResult,
+    BatchResult,
+    VisitCreate,
+    VisitPatch,
+)
+from app.features.visits.write_repo import (
+    DestinationRepository,
+    VisitRepository,
+    VisitTypeRepository,
+)
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+UNCHANGED = "unchanged"
+NOT_FOUND = "not_found"
+INVALID = "invalid"
+
+FAILED = {NOT_FOUND, INVALID}
+
+# Columns a patch may omit but not clear
+REQUIRED_FIELDS = ("visitor", "visit_type_id", "destination_id", "entry_time")
+
+
+class VisitBatch:
+    """
+    Applies a batch of visit writes in one transaction with bulk statements.
+    Items that reference an unknown visit type or destination, or an
+    unknown visit, are reported as failed and left out; the rest are
+    applied together.
+    """
+
+    def __init__(
+        self,
+        visits: VisitRepository = Depends(VisitRepository),
+        visit_types: VisitTypeRepository = Depends(VisitTypeRepository),
+        destinations: DestinationRepository = Depends(DestinationRepository),
+        events: VisitEvents = Depends(VisitEvents),
+    ):
+        self.visits = visits
+        self.visit_types = visit_types
+        self.destinations = destinations
+        self.events = events
+
+    async def create(self, items: List[VisitCreate]) -> BatchResult:
+        rows = [item.model_dump() for item in items]
+        results = await self._check_references(rows)
+
+        valid = [index for index, result in enumerate(results) if not result]
+        ids = await self.visits.create_many([rows[index] for index in valid])
+        for index, id in zip(valid, ids):
+            results[index] = BatchItemResult(
+                index=index, id=id, status=CREATED
+            )
+        if self.events.listening:
+            await self.events.created(
+                [Visit(id=id, **rows[index]) for index, id in zip(valid, ids)]
+            )
+        return self._summary(results)
+
+    async def update(self, items: List[VisitPatch]) -> BatchResult:
+        rows = [item.model_dump(exclude_unset=True) for item in items]
+        results = await self._check_references(rows)
+
+        changes = []
+        for index, row in enumerate(rows):
+            if results[index]:
+                continue
+            if len(row) == 1:
+                results[index] = BatchItemResult(
+                    index=index, id=row["id"], status=UNCHANGED
+                )
+            else:
+                changes.append(index)
+
+        updated = set(
+            await self.visits.update_many([rows[index] for index in changes])
+        )
+        for index in changes:
+            id = rows[index]["id"]
+            results[index] = (
+                BatchItemResult(index=index, id=id, status=UPDATED)
+                if id in updated
+                else BatchItemResult(
+                    index=index,
+                    id=id,
+                    status=NOT_FOUND,
+                    detail="Visit not found",
+                )
+            )
+        await self.events.exited_ids(
+            [
+                rows[index]["id"]
+                for index in changes
+                if rows[index]["id"] in updated
+                and rows[index].get("exit_time") is not None
+            ]
+        )
+        return self._summary(results)
+
+    async def delete(self, ids: List[int]) -> BatchResult:
+        deleted = set(await self.visits.delete_many(ids))
+        return self._summary(
+            [
+                (
+                    BatchItemResult(index=index, id=id, status=DELETED)
+                    if id in deleted
+                    else BatchItemResult(
+                        index=index,
+                        id=id,
+                        status=NOT_FOUND,
+                        detail="Visit not found",
+                    )
+                )
+                for index, id in enumerate(ids)
+            ]
+        )
+
+    async def check(self, row: dict) -> Optional[str]:
+        """
+        Why a single create or (partial) update cannot be written, if it
+        cannot.
+        """
+        result = (await self._check_references([row]))[0]
+        return result.detail if result else None
+
+    async def _check_references(
+        self, rows: List[dict]
+    ) -> List[Optional[BatchItemResult]]:
+        # Both reference tables are cached, so this is a memory lookup
+        visit_types = await self.visit_types.get_many(
+            row["visit_type_id"]
+            for row in rows
+            if row.get("visit_type_id") is not None
+        )
+        destinations = await self.destinations.get_many(
+            row["destination_id"]
+            for row in rows
+            if row.get("destination_id") is not None
+        )
+
+        results: List[Optional[BatchItemResult]] = []
+        for index, row in enumerate(rows):
+            detail = self._item_error(row, visit_types, destinations)
+            results.append(
+                BatchItemResult(
+                    index=index,
+                    id=row.get("id"),
+                    status=INVALID,
+                    detail=detail,
+                )
+                if detail
+                else None
+            )
+        return results
+
+    @staticmethod
+    def _item_error(
+        row: dict,
+        visit_types: Dict[int, object],
+        destinations: Dict[int, object],
+    ) -> Optional[str]:
+        for field in REQUIRED_FIELDS:
+            if field in row and row[field] is None:
+                return f"{field} cannot be null"
+        if "visit_type_id" in row and row["visit_type_id"] not in visit_types:
+            return "Visit type not found"
+        if (
+            "destination_id" in row
+            and row["destination_id"] not in destinations
+        ):
+            return "Destination not found"
+        return None
+
+    @staticmethod
+    def _summary(results: List[BatchItemResult]) -> BatchResult:
+        failed = sum(result.status in FAILED for result in results)
+        return BatchResult(
+            succeeded=len(results) - failed, failed=failed, items=results
+        )
@@ -0,0 +1,104 @@
+import asyncio
+from typing import AsyncIterator, List, Optional, Sequence
+
+from fastapi import Depends
+
+from app.core.config import settings
+from app.core.pubsub import Message, PubSub
+from app.features.visits.models import Visit
+from app.features.visits.serializers import VisitSerializer
+from app.features.visits.write_repo import VisitRepository
+
+VISIT_CREATED = "visit_created"
+VISIT_EXITED = "visit_exited"
+
+# Arrivals and departures of this worker, keyed by destination id
+visit_feed = PubSub(
+    "visits",
+    queue_size=settings.events_queue_size,
+    max_dropped=settings.events_max_dropped,
+    history=settings.events_history,
+)
+
+
+class VisitEvents:
+    """
+    Publishes the visits written by a request to ``visit_feed`` once they
+    are committed. Nothing is serialized or loaded while nobody listens.
+    """
+
+    def __init__(
+        self,
+        visits: VisitRepository = Depends(VisitRepository),
+        serializer: VisitSerializer = Depends(VisitSerializer),
+    ):
+        self.visits = visits
+        self.serializer = serializer
+
+    @property
+    def listening(self) -> bool:
+        return visit_feed.has_subscribers
+
+    async def created(self, visits: Sequence[Visit]) -> None:
+        await self._publish(VISIT_CREATED, visits)
+
+    async def exited(self, visits: Sequence[Visit]) -> None:
+        await self._publish(VISIT_EXITED, visits)
+
+    async def exited_ids(self, ids: List[int]) -> None:
+        """
+        Publish exits known only by id, as left by the bulk updates.
+        """
+        if not ids or not self.listening:
+            return
+        await self.exited(
+            await self.visits.get_all(options=(), criteria=[Visit.id.in_(ids)])
+        )
+
+    async def _publish(self, type: str, visits: Sequence[Visit]) -> None:
+        if not visits or not self.listening:
+            return
+        for visit in await self.serializer.serialize_many(visits):
+            visit_feed.publish(
+                type, visit.model_dump_json(), key=visit.destination.id
+            )
+
+
+def sse_message(message: Message) -> str:
+    return f"id: {message.id}\nevent: {message.type}\ndata: {message.data}\n\n"
+
+
+async def sse_stream(
+    destination_id: Optional[int] = None,
+    last_id: Optional[int] = None,
+    keepalive: float = 15.0,
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events of ``visit_feed`` until the client goes away or is
+    closed as a slow consumer. The subscription lives as long as the
+    stream, and a comment is sent after ``keepalive`` idle seconds so
+    proxies keep the connection open.
+    """
+    subscription = visit_feed.subscribe(destination_id, last_id)
+    try:
+        yield f"retry: {settings.events_retry_ms}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.get(), timeout=keepalive
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if message is None:
+                return
+            yield sse_message(message)
+    finally:
+        visit_feed.unsubscribe(subscription)
+
+
+def parse_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,239 @@
+import csv
+import io
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Select, select
+
+from app.core.write_db import SessionLocal
+from app.features.visits.models import Destination, Visit, VisitType
+from app.features.visits.projections import (
+    destination_document,
+    visit_document,
+    visit_type_document,
+)
+
+CSV = "csv"
+PARQUET = "parquet"
+MEDIA_TYPES = {
+    CSV: "text/csv",
+    PARQUET: "application/vnd.apache.parquet",
+}
+
+# Rows fetched per read DB round trip and encoded per CSV chunk / Parquet
+# row group
+EXPORT_BATCH_ROWS = 5000
+
+COLUMNS = (
+    "id",
+    "visitor",
+    "visit_type_id",
+    "visit_type",
+    "destination_id",
+    "destination",
+    "location",
+    "entry_time",
+    "exit_time",
+)
+
+
+def entry_time_range(
+    day_from: Optional[date], day_to: Optional[date]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Turn an inclusive day range into a half-open ``entry_time`` range.
+    """
+    start = datetime.combine(day_from, time.min) if day_from else None
+    end = (
+        datetime.combine(day_to + timedelta(days=1), time.min)
+        if day_to
+        else None
+    )
+    return start, end
+
+
+def document_row(document: dict) -> tuple:
+    """
+    Flatten a visit read-model document into the export columns.
+    """
+    return (
+        document["id"],
+        document["visitor"],
+        document["visit_type_id"],
+        document["visit_type"]["name"],
+        document["destination_id"],
+        document["destination"]["name"],
+        document["destination"]["location"],
+        document["entry_time"],
+        document.get("exit_time"),
+    )
+
+
+def export_query() -> Select:
+    """
+    The export columns of the write DB visits, references joined.
+    """
+    return (
+        select(
+            Visit.id,
+            Visit.visitor,
+            VisitType.id,
+            VisitType.name,
+            Destination.id,
+            Destination.name,
+            Destination.location,
+            Visit.entry_time,
+            Visit.exit_time,
+        )
+        .join(VisitType, Visit.visit_type_id == VisitType.id)
+        .join(Destination, Visit.destination_id == Destination.id)
+    )
+
+
+def iter_write_rows(
+    entry_from: Optional[datetime] = None,
+    entry_to: Optional[datetime] = None,
+    batch_size: int = EXPORT_BATCH_ROWS,
+) -> Iterator[tuple]:
+    """
+    Export rows of the visits still in the write DB, in entry order, for
+    when the read DB is down. The stream owns its session so it can
+    outlive the request.
+    """
+    query = export_query()
+    if entry_from is not None:
+        query = query.where(Visit.entry_time >= entry_from)
+    if entry_to is not None:
+        query = query.where(Visit.entry_time < entry_to)
+    query = query.order_by(Visit.entry_time, Visit.id)
+    with SessionLocal() as db:
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        for row in result:
+            yield tuple(row)
+
+
+def row_document(row: tuple) -> dict:
+    """
+    Rebuild the read-model document of a visit from its export row.
+    """
+    id, visitor, type_id, type_name, dest_id, dest_name, location = row[:7]
+    return visit_document(
+        id,
+        visitor,
+        visit_type_document(type_id, type_name),
+        destination_document(dest_id, dest_name, location),
+        row[7],
+        row[8],
+    )
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def csv_chunks(
+    rows: Iterable[tuple], batch_rows: int = EXPORT_BATCH_ROWS
+) -> Iterator[str]:
+    """
+    Encode rows as CSV, yielding one chunk per ``batch_rows`` rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for batch in _batches(rows, batch_rows):
+        writer.writerows(
+            tuple(
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            )
+            for row in batch
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # The header alone when there are no rows
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file that hands out what was written so far, so a Parquet
+    writer's output can be streamed as it goes.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("visitor", pa.string()),
+            ("visit_type_id", pa.int64()),
+            ("visit_type", pa.string()),
+            ("destination_id", pa.int64()),
+            ("destination", pa.string()),
+            ("location", pa.string()),
+            ("entry_time", pa.timestamp("us")),
+            ("exit_time", pa.timestamp("us")),
+        ]
+    )
+
+
+def record_batch(rows: List[tuple], schema):
+    import pyarrow as pa
+
+    return pa.record_batch(
+        [
+            pa.array(column, type=field.type)
+            for column, field in zip(zip(*rows), schema)
+        ],
+        schema=schema,
+    )
+
+
+def parquet_chunks(
+    rows: Iterable[tuple], batch_rows: int = EXPORT_BATCH_ROWS
+) -> Iterator[bytes]:
+    """
+    Encode rows as Parquet, one row group per ``batch_rows`` rows, yielding
+    the bytes of every row group as soon as it is written.
+    """
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema()
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in _batches(rows, batch_rows):
+            writer.write_batch(record_batch(batch, schema))
+            yield sink.drain()
+    # Footer
+    yield sink.drain()
@@ -0,0 +1,103 @@
+import re
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import Query
+
+from app.core.write_db import naive_utc
+from app.features.visits.models import Visit
+
+PREFIX = "prefix"
+CONTAINS = "contains"
+# Not a backslash, which some servers already treat as a string escape
+LIKE_ESCAPE = "/"
+
+
+def _like_pattern(text: str) -> str:
+    # The user's text is matched literally, wildcards included
+    return re.sub(r"([/%_])", r"/\1", text)
+
+
+class VisitFilters:
+    """
+    Visit list filters shared by the write and read model endpoints. Time
+    ranges are half-open (``from`` inclusive, ``to`` exclusive). Each
+    filter is turned into SQL criteria or a Mongo query, so it is applied
+    by the database and served by the visit indexes.
+    """
+
+    def __init__(
+        self,
+        visitor: Optional[str] = Query(
+            None, min_length=1, description="Visitor name to look for."
+        ),
+        visitor_match: Literal["prefix", "contains"] = Query(
+            CONTAINS,
+            description=(
+                "How ``visitor`` is matched, ignoring case. On the read "
+                "model ``contains`` matches whole words (text index)."
+            ),
+        ),
+        destination_id: Optional[int] = None,
+        visit_type_id: Optional[int] = None,
+        entry_from: Optional[datetime] = None,
+        entry_to: Optional[datetime] = None,
+        exit_from: Optional[datetime] = None,
+        exit_to: Optional[datetime] = None,
+    ):
+        self.visitor = visitor
+        self.visitor_match = visitor_match
+        self.destination_id = destination_id
+        self.visit_type_id = visit_type_id
+        # Compared with the naive UTC columns, which asyncpg only accepts
+        # naive values for
+        self.entry_from = naive_utc(entry_from)
+        self.entry_to = naive_utc(entry_to)
+        self.exit_from = naive_utc(exit_from)
+        self.exit_to = naive_utc(exit_to)
+
+    def sql_criteria(self) -> List:
+        criteria = []
+        if self.visitor:
+            pattern = _like_pattern(self.visitor) + "%"
+            if self.visitor_match == CONTAINS:
+                pattern = "%" + pattern
+            # Served by the trigram index on PostgreSQL
+            criteria.append(Visit.visitor.ilike(pattern, escape=LIKE_ESCAPE))
+        if self.destination_id is not None:
+            criteria.append(Visit.destination_id == self.destination_id)
+        if self.visit_type_id is not None:
+            criteria.append(Visit.visit_type_id == self.visit_type_id)
+        if self.entry_from is not None:
+            criteria.append(Visit.entry_time >= self.entry_from)
+        if self.entry_to is not None:
+            criteria.append(Visit.entry_time < self.entry_to)
+        if self.exit_from is not None:
+            criteria.append(Visit.exit_time >= self.exit_from)
+        if self.exit_to is not None:
+            criteria.append(Visit.exit_time < self.exit_to)
+        return criteria
+
+    def mongo_query(self) -> dict:
+        query = {}
+        if self.visitor:
+            if self.visitor_match == PREFIX:
+                # Case-sensitive so the index bounds stay tight
+                query["visitor_lc"] = {
+                    "$regex": "^" + re.escape(self.visitor.lower())
+                }
+            else:
+                query["$text"] = {"$search": self.visitor}
+        if self.destination_id is not None:
+            query["destination_id"] = self.destination_id
+        if self.visit_type_id is not None:
+            query["visit_type_id"] = self.visit_type_id
+        for field, start, end in (
+            ("entry_time", self.entry_from, self.entry_to),
+            ("exit_time", self.exit_from, self.exit_to),
+        ):
+            if start is not None:
+                query.setdefault(field, {})["$gte"] = start
+            if end is not None:
+                query.setdefault(field, {})["$lt"] = end
+        return query
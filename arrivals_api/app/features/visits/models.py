@@ -1,9 +1,16 @@
-from datetime import datetime, timezone
-
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    event,
+)
 from sqlalchemy.orm import relationship
 
-from app.core.write_db import Base
+from app.core.write_db import Base, utcnow
 
 
 class Visit(Base):
@@ -17,14 +24,51 @@ class Visit(Base):
     destination_id = Column(
         Integer, ForeignKey("destinations.id"), nullable=False
     )
-    entry_time = Column(
-        DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
-    )
+    entry_time = Column(DateTime, nullable=False, default=utcnow)
     exit_time = Column(DateTime, nullable=True)
 
-    # Relationships
-    visit_type = relationship("VisitType", back_populates="visits")
-    destination = relationship("Destination", back_populates="visits")
+    # Relationships. Lazy loading is disabled so that serializing a list of
+    # visits cannot fall into 1 + 2N queries; load them with the repository
+    # loader options instead.
+    visit_type = relationship(
+        "VisitType", back_populates="visits", lazy="raise"
+    )
+    destination = relationship(
+        "Destination", back_populates="visits", lazy="raise"
+    )
+
+    __table_args__ = (
+        Index("ix_visits_destination_entry_time", destination_id, entry_time),
+        # Only visits still on site: stays tiny however long the history is
+        Index(
+            "ix_visits_open_destination_entry_time",
+            destination_id,
+            entry_time,
+            postgresql_where=exit_time.is_(None),
+            sqlite_where=exit_time.is_(None),
+        ),
+        # List filters
+        Index("ix_visits_visit_type_entry_time", visit_type_id, entry_time),
+        Index("ix_visits_entry_time", entry_time),
+        Index("ix_visits_exit_time", exit_time),
+        # Case-insensitive prefix and substring search on the visitor name
+        Index(
+            "ix_visits_visitor_trgm",
+            visitor,
+            postgresql_using="gin",
+            postgresql_ops={"visitor": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# The trigram operator class comes from the pg_trgm extension
+event.listen(
+    Visit.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        dialect="postgresql"
+    ),
+)
 
 
 class VisitType(Base):
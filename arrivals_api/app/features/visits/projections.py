@@ -0,0 +1,185 @@
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateMany, UpdateOne
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.projector import Projection
+from app.features.reports.rollups import (
+    DESTINATION,
+    ROLLUPS_COLLECTION,
+    VISIT_TYPE,
+    rollup_id,
+    rollup_operations,
+)
+from app.features.visits.models import Destination, Visit, VisitType
+from app.features.visits.write_repo import VISIT_LOADER_OPTIONS
+
+logger = logging.getLogger(__name__)
+
+
+def visit_type_document(id: int, name: str) -> dict:
+    return {"_id": id, "id": id, "name": name}
+
+
+def destination_document(id: int, name: str, location: str) -> dict:
+    return {"_id": id, "id": id, "name": name, "location": location}
+
+
+def visit_document(
+    id: int,
+    visitor: str,
+    visit_type: dict,
+    destination: dict,
+    entry_time: datetime,
+    exit_time: Optional[datetime] = None,
+) -> dict:
+    """
+    Denormalized read-model document for a visit. The visit type and
+    destination are embedded so a visit can be served with a single lookup,
+    while their ids are kept at the top level for filtering. ``visitor_lc``
+    backs the case-insensitive prefix search.
+    """
+    return {
+        "_id": id,
+        "id": id,
+        "visitor": visitor,
+        "visitor_lc": visitor.lower(),
+        "visit_type_id": visit_type["id"],
+        "visit_type": {"id": visit_type["id"], "name": visit_type["name"]},
+        "destination_id": destination["id"],
+        "destination": {
+            "id": destination["id"],
+            "name": destination["name"],
+            "location": destination["location"],
+        },
+        "entry_time": entry_time,
+        "exit_time": exit_time,
+    }
+
+
+class VisitProjection(Projection):
+    aggregate = "visits"
+    collection = "visits"
+    needs_previous = True
+
+    def load(self, db: Session, ids: List[int]) -> List[dict]:
+        visits = db.scalars(
+            select(Visit)
+            .options(*VISIT_LOADER_OPTIONS)
+            .where(Visit.id.in_(ids))
+        )
+        documents = []
+        for visit in visits:
+            if visit.visit_type is None or visit.destination is None:
+                # Left out of the read model, like a deleted visit, instead
+                # of failing the whole batch
+                logger.warning(
+                    "Visit %s references a missing type or place", visit.id
+                )
+                continue
+            documents.append(
+                visit_document(
+                    visit.id,
+                    visit.visitor,
+                    visit_type_document(
+                        visit.visit_type.id, visit.visit_type.name
+                    ),
+                    destination_document(
+                        visit.destination.id,
+                        visit.destination.name,
+                        visit.destination.location,
+                    ),
+                    visit.entry_time,
+                    visit.exit_time,
+                )
+            )
+        return documents
+
+    def cascade(
+        self, documents: List[dict], previous: List[dict], batch: ObjectId
+    ) -> Dict[str, list]:
+        # Move every changed visit out of the rollup buckets it was counted
+        # in and into the ones it belongs to now
+        return {
+            ROLLUPS_COLLECTION: rollup_operations(
+                added=documents, removed=previous, batch=batch
+            )
+        }
+
+
+class VisitTypeProjection(Projection):
+    aggregate = "visit_types"
+    collection = "visit_types"
+
+    def load(self, db: Session, ids: List[int]) -> List[dict]:
+        rows = db.execute(
+            select(VisitType.id, VisitType.name).where(VisitType.id.in_(ids))
+        )
+        return [visit_type_document(row.id, row.name) for row in rows]
+
+    def cascade(
+        self, documents: List[dict], previous: List[dict], batch: ObjectId
+    ) -> Dict[str, list]:
+        # Visits and rollups embed a copy of the type name
+        return {
+            "visits": [
+                UpdateMany(
+                    {"visit_type_id": document["id"]},
+                    {"$set": {"visit_type.name": document["name"]}},
+                )
+                for document in documents
+            ],
+            ROLLUPS_COLLECTION: [
+                UpdateOne(
+                    {"_id": rollup_id(VISIT_TYPE, document["id"])},
+                    {"$set": {"label": document["name"]}},
+                )
+                for document in documents
+            ],
+        }
+
+
+class DestinationProjection(Projection):
+    aggregate = "destinations"
+    collection = "destinations"
+
+    def load(self, db: Session, ids: List[int]) -> List[dict]:
+        rows = db.execute(
+            select(
+                Destination.id, Destination.name, Destination.location
+            ).where(Destination.id.in_(ids))
+        )
+        return [
+            destination_document(row.id, row.name, row.location)
+            for row in rows
+        ]
+
+    def cascade(
+        self, documents: List[dict], previous: List[dict], batch: ObjectId
+    ) -> Dict[str, list]:
+        # Visits and rollups embed a copy of the destination
+        return {
+            ROLLUPS_COLLECTION: [
+                UpdateOne(
+                    {"_id": rollup_id(DESTINATION, document["id"])},
+                    {"$set": {"label": document["name"]}},
+                )
+                for document in documents
+            ],
+            "visits": [
+                UpdateMany(
+                    {"destination_id": document["id"]},
+                    {
+                        "$set": {
+                            "destination.name": document["name"],
+                            "destination.location": document["location"],
+                        }
+                    },
+                )
+                for document in documents
+            ],
+        }
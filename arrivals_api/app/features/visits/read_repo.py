@@ -1,10 +1,73 @@
-from app.features.visits.schemas import VisitOut, VisitTypeOut, DestinationOut
+import logging
+from datetime import datetime
+from typing import Iterator, Optional
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import PyMongoError
+
+from app.core.async_read_base_repository import AsyncReadRepository
 from app.core.read_base_repository import ReadRepository
+from app.core.read_db import ReadDBUnavailable, connection_lost
+from app.features.visits.schemas import DestinationOut, VisitOut, VisitTypeOut
+
+logger = logging.getLogger(__name__)
 
 
 class VisitRepository(ReadRepository):
+    collection_name = "visits"
+    indexes = [
+        IndexModel([("entry_time", DESCENDING)]),
+        IndexModel(
+            [("destination_id", ASCENDING), ("entry_time", DESCENDING)]
+        ),
+        IndexModel([("visit_type_id", ASCENDING), ("entry_time", DESCENDING)]),
+        IndexModel([("exit_time", DESCENDING)]),
+        # Prefix search (anchored regex on the lower-cased visitor) and
+        # word search ($text)
+        IndexModel([("visitor_lc", ASCENDING)]),
+        IndexModel([("visitor", TEXT)]),
+    ]
+
+    def __init__(self):
+        super().__init__(self.collection_name, VisitOut)
+
+    def iter_entry_range(
+        self,
+        entry_from: Optional[datetime] = None,
+        entry_to: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[dict]:
+        """
+        Yield raw visit documents with ``entry_from <= entry_time <
+        entry_to`` in entry order, ``batch_size`` per round trip. Documents
+        are not validated into models, for bulk exports.
+        """
+        query = {}
+        if entry_from is not None:
+            query.setdefault("entry_time", {})["$gte"] = entry_from
+        if entry_to is not None:
+            query.setdefault("entry_time", {})["$lt"] = entry_to
+        self._check()
+        try:
+            cursor = (
+                self.collection.find(query, {"_id": 0})
+                .sort([("entry_time", ASCENDING), ("_id", ASCENDING)])
+                .batch_size(batch_size)
+            )
+            yield from cursor
+        except PyMongoError as e:
+            logger.error("Error streaming visits: %s", e)
+            if connection_lost(e):
+                raise ReadDBUnavailable() from e
+            raise
+
+
+class AsyncVisitRepository(AsyncReadRepository[VisitOut]):
+    # Indexes are declared on VisitRepository
+    collection_name = VisitRepository.collection_name
+
     def __init__(self):
-        super().__init__("visits", VisitOut)
+        super().__init__(self.collection_name, VisitOut)
 
 
 class VisitTypeRepository(ReadRepository):
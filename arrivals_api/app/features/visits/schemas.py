@@ -1,6 +1,16 @@
-from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, List, Optional
+
+from pydantic import AfterValidator, BaseModel, Field
+
+from app.core.write_db import naive_utc
+
+# Most items accepted by one /visits/batch request
+MAX_BATCH_SIZE = 5000
+
+# Visit times are stored as naive UTC; aware input is converted on the way
+# in, since asyncpg rejects aware values for the naive columns
+UTCDateTime = Annotated[datetime, AfterValidator(naive_utc)]
 
 
 # VisitType Schemas
@@ -36,8 +46,8 @@ class VisitCreate(BaseModel):
     visitor: str
     visit_type_id: int
     destination_id: int
-    entry_time: datetime
-    exit_time: Optional[datetime] = None
+    entry_time: UTCDateTime
+    exit_time: Optional[UTCDateTime] = None
 
 
 class VisitOut(BaseModel):
@@ -50,3 +60,59 @@ class VisitOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class VisitUpdate(BaseModel):
+    # Partial update: only the fields that are sent are written
+    visitor: Optional[str] = None
+    visit_type_id: Optional[int] = None
+    destination_id: Optional[int] = None
+    entry_time: Optional[UTCDateTime] = None
+    exit_time: Optional[UTCDateTime] = None
+
+
+class VisitPatch(VisitUpdate):
+    id: int
+
+
+# Batch results
+class BatchItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: str
+    detail: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    items: List[BatchItemResult]
+
+
+# Synthetic data generation
+class VisitGenerate(BaseModel):
+    count: int = Field(100_000, ge=1, le=1_000_000)
+    batch_size: int = Field(5000, ge=100, le=50_000)
+    seed: Optional[int] = None
+
+
+class SeedReport(BaseModel):
+    visit_types: int
+    destinations: int
+    visits: int
+    batch_size: int
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+# Archival of closed visits
+class VisitArchiveRequest(BaseModel):
+    # Defaults to the ARCHIVE_AFTER_DAYS setting
+    older_than_days: Optional[int] = Field(None, ge=0)
+
+
+class ArchiveReport(BaseModel):
+    cutoff: datetime
+    visits: int
+    segments: List[str]
+    elapsed_seconds: float
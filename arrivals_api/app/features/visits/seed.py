@@ -0,0 +1,234 @@
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.etag import collection_versions
+from app.core.outbox import UPSERT, OutboxEvent, event_rows
+from app.core.projector import projector
+from app.core.read_db import ReadDBUnavailable
+from app.core.write_db import utcnow
+from app.features.visits.models import Destination, Visit, VisitType
+from app.features.visits.schemas import SeedReport
+
+VISIT_TYPES = [
+    "Proveedor",
+    "Cliente",
+    "Entrevista",
+    "Mantenimiento",
+    "Entrega",
+    "Auditoría",
+    "Personal",
+]
+
+DESTINATIONS = [
+    ("Recepción", "Edificio A"),
+    ("Recursos Humanos", "Edificio A"),
+    ("Finanzas", "Edificio A"),
+    ("Gerencia", "Edificio B"),
+    ("Tecnología", "Edificio B"),
+    ("Ventas", "Edificio B"),
+    ("Bodega", "Edificio C"),
+    ("Producción", "Edificio C"),
+    ("Laboratorio", "Edificio C"),
+    ("Cafetería", "Edificio D"),
+]
+
+FIRST_NAMES = [
+    "Ana", "Carlos", "María", "José", "Lucía", "Miguel", "Sofía", "Jorge",
+    "Elena", "Luis", "Carmen", "Pedro", "Laura", "Diego", "Rosa", "Andrés",
+    "Paula", "Fernando", "Isabel", "Ricardo",
+]  # fmt: skip
+
+LAST_NAMES = [
+    "García", "Martínez", "López", "Hernández", "González", "Pérez",
+    "Rodríguez", "Sánchez", "Ramírez", "Flores", "Rivera", "Gómez",
+    "Díaz", "Cruz", "Morales", "Reyes", "Ortiz", "Castillo",
+]  # fmt: skip
+
+# Share of generated visits that are still on site (no exit time)
+OPEN_VISIT_RATIO = 0.02
+HISTORY_DAYS = 365
+
+
+class VisitSeeder:
+    """
+    Generates synthetic visit types, destinations and visits. Visits are
+    written in fixed-size batches: one multi-row INSERT per batch on the write
+    DB, committed with the batch's outbox events. The projector then writes
+    the read documents and rollups like for any other write.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = 5000,
+        seed: Optional[int] = None,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+
+    def run(self, count: int) -> SeedReport:
+        start = time.perf_counter()
+
+        visit_types = self._seed_visit_types()
+        destinations = self._seed_destinations()
+
+        now = utcnow()
+        created = 0
+        while created < count:
+            size = min(self.batch_size, count - created)
+            self._insert_batch(size, visit_types, destinations, now)
+            created += size
+
+        elapsed = time.perf_counter() - start
+        return SeedReport(
+            visit_types=len(visit_types),
+            destinations=len(destinations),
+            visits=created,
+            batch_size=self.batch_size,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(created / elapsed, 1) if elapsed else 0.0,
+        )
+
+    def _seed_visit_types(self) -> List[int]:
+        existing = set(self.db.scalars(select(VisitType.name)))
+        missing = [{"name": n} for n in VISIT_TYPES if n not in existing]
+        if missing:
+            self._insert(VisitType, "visit_types", missing)
+        return list(self.db.scalars(select(VisitType.id)))
+
+    def _seed_destinations(self) -> List[int]:
+        existing = set(self.db.scalars(select(Destination.name)))
+        missing = [
+            {"name": name, "location": location}
+            for name, location in DESTINATIONS
+            if name not in existing
+        ]
+        if missing:
+            self._insert(Destination, "destinations", missing)
+        return list(self.db.scalars(select(Destination.id)))
+
+    def _insert_batch(
+        self,
+        size: int,
+        visit_types: List[int],
+        destinations: List[int],
+        now: datetime,
+    ) -> None:
+        rows = []
+        for _ in range(size):
+            entry_time, exit_time = self._random_times(now)
+            rows.append(
+                {
+                    "visitor": self._random_visitor(),
+                    "visit_type_id": self.random.choice(visit_types),
+                    "destination_id": self.random.choice(destinations),
+                    "entry_time": entry_time,
+                    "exit_time": exit_time,
+                }
+            )
+        self._insert(Visit, "visits", rows)
+
+    def _insert(self, model, aggregate: str, rows: List[dict]) -> None:
+        """
+        Insert ``rows`` with one multi-row INSERT, committed together with
+        their outbox events so the read DB cannot miss any of them.
+        """
+        try:
+            ids = self.db.scalars(
+                insert(model).returning(
+                    model.id, sort_by_parameter_order=True
+                ),
+                rows,
+            ).all()
+            self.db.execute(
+                insert(OutboxEvent), event_rows(aggregate, ids, UPSERT)
+            )
+            self.db.execute(collection_versions.bump(aggregate))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        projector.notify(len(ids))
+
+    def _random_visitor(self) -> str:
+        return (
+            f"{self.random.choice(FIRST_NAMES)} "
+            f"{self.random.choice(LAST_NAMES)}"
+        )
+
+    def _random_times(self, now: datetime):
+        if self.random.random() < OPEN_VISIT_RATIO:
+            entry_time = now - timedelta(minutes=self.random.randint(1, 480))
+            return entry_time, None
+
+        entry_time = now - timedelta(
+            days=self.random.randint(0, HISTORY_DAYS),
+            minutes=self.random.randint(0, 24 * 60),
+        )
+        exit_time = entry_time + timedelta(
+            minutes=self.random.randint(5, 8 * 60)
+        )
+        return entry_time, min(exit_time, now)
+
+
+def build_seeder(
+    db: Session, batch_size: int, seed: Optional[int] = None
+) -> VisitSeeder:
+    """
+    Seeder for ``db``. Raises ``ReadDBUnavailable`` before anything is
+    written when the read DB is not configured or is down, rather than
+    piling up outbox events nothing can project.
+    """
+    from app.features.visits import read_repo
+
+    if not read_repo.VisitRepository().available:
+        raise ReadDBUnavailable()
+    return VisitSeeder(db, batch_size=batch_size, seed=seed)
+
+
+def project_outbox(batch_size: int) -> int:
+    """
+    Project every pending outbox event from this process, since no server
+    may be running to do it after seeding. Returns how many were projected.
+    """
+    projected = 0
+    while drained := projector.drain_once(batch_size):
+        projected += drained
+    return projected
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from app.core.write_db import Base, SessionLocal, write_db
+
+    parser = argparse.ArgumentParser(
+        description="Seed synthetic visits into the write and read DBs."
+    )
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=write_db.engine)
+    db = SessionLocal()
+    try:
+        report = build_seeder(db, args.batch_size, args.seed).run(args.count)
+    finally:
+        db.close()
+
+    print(
+        f"Inserted {report.visits} visits in {report.elapsed_seconds}s "
+        f"({report.rows_per_second} rows/s)"
+    )
+    projected = project_outbox(args.batch_size)
+    print(f"Projected {projected} outbox events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from typing import AsyncIterator, List, Sequence
+
+from fastapi import Depends
+
+from app.features.visits.models import Visit
+from app.features.visits.schemas import VisitOut
+from app.features.visits.write_repo import (
+    DestinationRepository,
+    VisitTypeRepository,
+)
+
+
+class VisitSerializer:
+    """
+    Builds ``VisitOut`` from bare visit rows, resolving their visit type and
+    destination from the in-process reference caches instead of joining
+    them in every query.
+    """
+
+    def __init__(
+        self,
+        visit_types: VisitTypeRepository = Depends(VisitTypeRepository),
+        destinations: DestinationRepository = Depends(DestinationRepository),
+    ):
+        self.visit_types = visit_types
+        self.destinations = destinations
+
+    async def serialize_many(self, visits: Sequence[Visit]) -> List[VisitOut]:
+        visit_types = await self.visit_types.get_many(
+            visit.visit_type_id for visit in visits
+        )
+        destinations = await self.destinations.get_many(
+            visit.destination_id for visit in visits
+        )
+        return [
+            VisitOut(
+                id=visit.id,
+                visitor=visit.visitor,
+                visit_type=visit_types[visit.visit_type_id],
+                destination=destinations[visit.destination_id],
+                entry_time=visit.entry_time,
+                exit_time=visit.exit_time,
+            )
+            for visit in visits
+        ]
+
+    async def serialize(self, visit: Visit) -> VisitOut:
+        return (await self.serialize_many([visit]))[0]
+
+    async def stream(
+        self, visits: AsyncIterator[Visit]
+    ) -> AsyncIterator[VisitOut]:
+        async for visit in visits:
+            yield await self.serialize(visit)
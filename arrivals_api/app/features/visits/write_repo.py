@@ -1,21 +1,74 @@
+from typing import List, Optional
+
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from app.core.write_base_repository import BaseRepository
-from app.core.write_db import get_db
+from app.core.async_write_base_repository import AsyncBaseRepository
+from app.core.config import settings
+from app.core.reference_cache import CachedReferenceRepository, ReferenceCache
+from app.core.write_db import get_async_db
 from app.features.visits.models import Destination, Visit, VisitType
+from app.features.visits.schemas import DestinationOut, VisitTypeOut
+
+# Both relationships are many-to-one, so joining them keeps every visit
+# read to a single query without multiplying rows.
+VISIT_LOADER_OPTIONS = (
+    joinedload(Visit.visit_type),
+    joinedload(Visit.destination),
+)
+
+
+visit_type_cache: ReferenceCache[VisitTypeOut] = ReferenceCache(
+    "visit_types", ttl=settings.reference_cache_ttl_seconds
+)
+destination_cache: ReferenceCache[DestinationOut] = ReferenceCache(
+    "destinations", ttl=settings.reference_cache_ttl_seconds
+)
 
 
-class DestinationRepository(BaseRepository[Destination]):
-    def __init__(self, db: Session = Depends(get_db)):
+class DestinationRepository(
+    CachedReferenceRepository[Destination, DestinationOut]
+):
+    aggregate = "destinations"
+    embedded_in = ("visits",)
+    cache = destination_cache
+    schema = DestinationOut
+
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
         super().__init__(Destination, db)
 
 
-class VisitRepository(BaseRepository[Visit]):
-    def __init__(self, db: Session = Depends(get_db)):
-        super().__init__(Visit, db)
+class VisitRepository(AsyncBaseRepository[Visit]):
+    aggregate = "visits"
+
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
+        super().__init__(Visit, db, loader_options=VISIT_LOADER_OPTIONS)
+
+    async def get_open(
+        self,
+        destination_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Visit]:
+        """
+        Visits still on site (no exit time), oldest entry first. Served by
+        the partial index on open visits.
+        """
+        query = select(Visit).where(Visit.exit_time.is_(None))
+        if destination_id is not None:
+            query = query.where(Visit.destination_id == destination_id)
+        result = await self.db.scalars(
+            query.order_by(Visit.entry_time, Visit.id).limit(limit)
+        )
+        return list(result.all())
+
 
+class VisitTypeRepository(CachedReferenceRepository[VisitType, VisitTypeOut]):
+    aggregate = "visit_types"
+    embedded_in = ("visits",)
+    cache = visit_type_cache
+    schema = VisitTypeOut
 
-class VisitTypeRepository(BaseRepository[VisitType]):
-    def __init__(self, db: Session = Depends(get_db)):
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
         super().__init__(VisitType, db)
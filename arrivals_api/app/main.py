@@ -1,24 +1,103 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
-from app.core.write_db import init_db
+from app.core.config import settings
+from app.core.etag import NotModified, not_modified_response
+from app.core.instrumentation import MetricsMiddleware
+from app.core.projector import projector
+from app.core.read_db import (
+    ReadDBUnavailable,
+    close_mongo_connection,
+    close_mongo_connection_async,
+    connect_to_mongo,
+    connect_to_mongo_async,
+)
+from app.core.read_health import read_db_monitor
+from app.core.worker_pool import QueueFullError
+from app.core.write_db import init_db, write_db
+from app.features.reports.api import report_router
+from app.features.system.api import metrics_router, system_router
 from app.features.users.api import auth_router, user_router
+from app.features.users.auth import password_executor
+from app.features.users.projections import UserProjection
+from app.features.visits.api import (
+    destination_router,
+    visit_router,
+    visit_type_router,
+)
+from app.features.visits.projections import (
+    DestinationProjection,
+    VisitProjection,
+    VisitTypeProjection,
+)
+
+projector.register(UserProjection())
+projector.register(VisitProjection())
+projector.register(VisitTypeProjection())
+projector.register(DestinationProjection())
 
 
 @asynccontextmanager
 async def lifespan(*args, **kwargs):
-    init_db()
+    # The launcher sets the schema up once for all the workers
+    if settings.init_db_on_startup:
+        init_db()
+    # Neither waits for the server; the monitor reports when it answers
+    connect_to_mongo()
+    await connect_to_mongo_async()
+    read_db_monitor.start()
+    projector.start()
     yield
+    await projector.stop()
+    await read_db_monitor.stop()
+    await close_mongo_connection_async()
+    close_mongo_connection()
+    await write_db.dispose()
+    password_executor.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(NotModified)
+async def not_modified_handler(request: Request, exc: NotModified):
+    return not_modified_response(exc.etag)
+
+
+@app.exception_handler(ReadDBUnavailable)
+async def read_db_unavailable_handler(
+    request: Request, exc: ReadDBUnavailable
+):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Read database unavailable"},
+        headers={"Retry-After": "5"},
+    )
+
+
+@app.exception_handler(QueueFullError)
+async def queue_full_handler(request: Request, exc: QueueFullError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
 
 
 app.include_router(user_router, prefix="/users", tags=["users"])
 app.include_router(auth_router, tags=["auth"])
+app.include_router(visit_router)
+app.include_router(visit_type_router)
+app.include_router(destination_router)
+app.include_router(report_router)
+app.include_router(system_router)
+app.include_router(metrics_router)
 
 if __name__ == "__main__":
+    # Single process for local runs; ``python -m app.server`` in production
     import uvicorn
 
     uvicorn.run(app, host="0.0.0.0", port=8000)
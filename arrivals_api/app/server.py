@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import os
+from importlib.util import find_spec
+from typing import List, Optional
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.read_db import MONGOMOCK_SCHEME
+
+APP = "app.main:app"
+# Faster implementation, and the one it falls back to
+LOOPS = ("uvloop", "asyncio")
+HTTP_PARSERS = ("httptools", "h11")
+
+
+def resolve(choice: str, options: tuple) -> str:
+    """
+    Implementation for ``choice``: ``auto`` takes the first of ``options``
+    when it is installed and the fallback otherwise.
+    """
+    fast, fallback = options
+    if choice == "auto":
+        return fast if find_spec(fast) else fallback
+    if choice == fast and not find_spec(fast):
+        raise SystemExit(f"{fast} is not installed")
+    return choice
+
+
+def worker_count(workers: int) -> int:
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def prepare_database() -> None:
+    """
+    Set up the write DB schema once, before the workers start, instead of
+    in the lifespan of every worker. The connections used here are closed
+    so no worker inherits them.
+    """
+    from app.core.write_db import init_db, write_db
+
+    init_db()
+    asyncio.run(write_db.dispose())
+    # Read by the workers' settings
+    os.environ["INIT_DB_ON_STARTUP"] = "false"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve the API with several worker processes."
+    )
+    parser.add_argument("--host", default=settings.server_host)
+    parser.add_argument("--port", type=int, default=settings.server_port)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.server_workers,
+        help="Worker processes, 0 for one per CPU core.",
+    )
+    parser.add_argument(
+        "--loop", choices=("auto",) + LOOPS, default=settings.server_loop
+    )
+    parser.add_argument(
+        "--http",
+        choices=("auto",) + HTTP_PARSERS,
+        default=settings.server_http,
+    )
+    parser.add_argument("--backlog", type=int, default=settings.server_backlog)
+    parser.add_argument(
+        "--keep-alive",
+        type=int,
+        default=settings.server_keep_alive_seconds,
+        help="Seconds an idle keep-alive connection is held open.",
+    )
+    parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        default=settings.server_limit_concurrency,
+        help="Connections per worker before answering 503, 0 for no limit.",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=settings.server_max_requests,
+        help="Requests a worker serves before it is replaced, 0 to never.",
+    )
+    parser.add_argument(
+        "--max-requests-jitter",
+        type=int,
+        default=settings.server_max_requests_jitter,
+        help="Random extra requests per worker, so they recycle apart.",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=settings.server_graceful_timeout_seconds,
+        help="Seconds a stopping worker waits for open requests.",
+    )
+    parser.add_argument(
+        "--no-access-log",
+        dest="access_log",
+        action="store_false",
+        default=settings.server_access_log,
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    workers = worker_count(args.workers)
+    loop = resolve(args.loop, LOOPS)
+    http = resolve(args.http, HTTP_PARSERS)
+
+    if workers > 1 and settings.init_db_on_startup:
+        prepare_database()
+    if workers > 1 and settings.read_db_url.startswith(MONGOMOCK_SCHEME):
+        print("mongomock keeps a separate read DB in every worker")
+    # A single process is not restarted by a supervisor, so it is never
+    # recycled
+    max_requests = args.max_requests or None if workers > 1 else None
+
+    print(
+        f"Serving {APP} on {args.host}:{args.port} with {workers} workers "
+        f"({loop} loop, {http} parser)"
+    )
+    # Workers are separate processes that import the app themselves, so
+    # each one builds its own engines and clients
+    uvicorn.run(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=args.backlog,
+        timeout_keep_alive=args.keep_alive,
+        limit_concurrency=args.limit_concurrency or None,
+        limit_max_requests=max_requests,
+        limit_max_requests_jitter=args.max_requests_jitter,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        access_log=args.access_log,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
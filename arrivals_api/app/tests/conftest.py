@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+# Settings are read on import. The tests drop and create tables, so they
+# always get a throwaway SQLite file and an in-memory read DB
+_write_db = os.path.join(tempfile.mkdtemp(), "arrivals-test.db")
+os.environ["WRITE_DB_URL"] = f"sqlite:///{_write_db}"
+os.environ["READ_DB_URL"] = "mongomock://localhost"
+os.environ["READ_DB_NAME"] = "arrivals_test"
+
+for name, value in {
+    "INITIAL_ADMIN_USERNAME": "admin",
+    "INITIAL_ADMIN_PASSWORD": "admin",
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.core.write_db import AsyncSessionLocal, Base, SessionLocal, write_db
+from app.features.visits.models import Destination, Visit, VisitType
+from app.features.visits.write_repo import DestinationRepository
+
+
+@pytest.fixture(autouse=True)
+def referenced_destination():
+    Base.metadata.drop_all(bind=write_db.engine)
+    Base.metadata.create_all(bind=write_db.engine)
+    with SessionLocal() as db:
+        visit_type = VisitType(name="Delivery")
+        destinations = [
+            Destination(name="Dock", location="Basement"),
+            Destination(name="Lobby", location="Ground floor"),
+        ]
+        db.add_all([visit_type, *destinations])
+        db.flush()
+        db.add(
+            Visit(
+                visitor="Ana",
+                visit_type_id=visit_type.id,
+                destination_id=destinations[0].id,
+                entry_time=datetime(2025, 1, 1, 8),
+            )
+        )
+        db.commit()
+    yield
+    Base.metadata.drop_all(bind=write_db.engine)
+
+
+async def delete_destinations() -> tuple:
+    try:
+        async with AsyncSessionLocal() as db:
+            repo = DestinationRepository(db)
+            with pytest.raises(ValueError):
+                await repo.delete_many([1, 2])
+            # The failed transaction was rolled back, so the session and
+            # both destinations are still there
+            remaining = [
+                destination.id for destination in await repo.get_all()
+            ]
+            deleted = await repo.delete_many([2])
+    finally:
+        await write_db.dispose()
+    return remaining, deleted
+
+
+def test_deleting_referenced_rows_rolls_back():
+    remaining, deleted = asyncio.run(delete_destinations())
+    assert remaining == [1, 2]
+    assert deleted == [2]
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.core.etag import collection_versions
+from app.core.write_db import AsyncSessionLocal, Base, write_db
+from app.features.visits.models import VisitType
+from app.features.visits.write_repo import VisitTypeRepository
+
+
+@pytest.fixture(autouse=True)
+def schema():
+    Base.metadata.drop_all(bind=write_db.engine)
+    Base.metadata.create_all(bind=write_db.engine)
+    yield
+    Base.metadata.drop_all(bind=write_db.engine)
+
+
+async def tag(read_model: bool = False) -> str:
+    # A session of its own, as another worker would have
+    async with AsyncSessionLocal() as db:
+        return await collection_versions.etag(
+            db, "visits", "limit=10", read_model
+        )
+
+
+async def tags_around_write() -> list:
+    try:
+        tags = [await tag(), await tag()]
+        async with AsyncSessionLocal() as db:
+            await VisitTypeRepository(db).create(VisitType(name="Delivery"))
+        tags += [await tag(), await tag(read_model=True)]
+    finally:
+        await write_db.dispose()
+    return tags
+
+
+def test_tags_only_change_on_writes():
+    before, again, after, read_model = asyncio.run(tags_around_write())
+    assert before == again
+    assert before.startswith('W/"visits-0-')
+    # Visit types are embedded in visits
+    assert after.startswith('W/"visits-1-')
+    # Not projected yet
+    assert read_model.startswith('W/"visits-1.0-')
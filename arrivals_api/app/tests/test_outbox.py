@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.core.outbox import OutboxEvent
+from app.core.write_db import AsyncSessionLocal, Base, write_db
+from app.features.visits.models import Destination, Visit, VisitType
+from app.features.visits.write_repo import (
+    DestinationRepository,
+    VisitRepository,
+    VisitTypeRepository,
+)
+
+
+@pytest.fixture(autouse=True)
+def schema():
+    Base.metadata.drop_all(bind=write_db.engine)
+    Base.metadata.create_all(bind=write_db.engine)
+    yield
+    Base.metadata.drop_all(bind=write_db.engine)
+
+
+async def write_through_outbox() -> tuple:
+    """
+    Run the async write path, single and bulk, and return the aware
+    datetimes it bound along with the outbox rows it recorded. asyncpg
+    rejects aware values for the naive ``DateTime`` columns.
+    """
+    aware = []
+
+    def before_cursor_execute(conn, cursor, statement, params, context, *a):
+        # Bound values before the dialect's type processing, which turns
+        # datetimes into strings on SQLite
+        aware.extend(
+            value
+            for parameters in context.compiled_parameters
+            for value in parameters.values()
+            if isinstance(value, datetime) and value.tzinfo is not None
+        )
+
+    sync_engine = write_db.async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        async with AsyncSessionLocal() as db:
+            visit_type = await VisitTypeRepository(db).create(
+                VisitType(name="Delivery")
+            )
+            [destination_id] = await DestinationRepository(db).create_many(
+                [{"name": "Dock", "location": "Basement"}]
+            )
+            visits = VisitRepository(db)
+            visit = await visits.create(
+                Visit(
+                    visitor="Ana",
+                    visit_type_id=visit_type.id,
+                    destination_id=destination_id,
+                    entry_time=datetime(2025, 1, 1, 8),
+                )
+            )
+            await visits.update_by_id(
+                visit.id, {"exit_time": datetime(2025, 1, 1, 9)}
+            )
+            await visits.delete_many([visit.id])
+            events = await db.scalar(select(func.count(OutboxEvent.id)))
+            created_at = await db.scalar(select(OutboxEvent.created_at))
+    finally:
+        event.remove(
+            sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+        await write_db.dispose()
+    return aware, events, created_at
+
+
+def test_outbox_rows_are_written_as_naive_utc():
+    aware, events, created_at = asyncio.run(write_through_outbox())
+    assert aware == []
+    assert events == 5
+    assert created_at.tzinfo is None
@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.core.write_db import AsyncSessionLocal, Base, SessionLocal, write_db
+from app.features.visits.models import Destination, Visit, VisitType
+from app.features.visits.schemas import VisitOut
+from app.features.visits.write_repo import VisitRepository
+
+VISITS = 50
+
+
+@pytest.fixture(scope="module", autouse=True)
+def visits():
+    Base.metadata.drop_all(bind=write_db.engine)
+    Base.metadata.create_all(bind=write_db.engine)
+    with SessionLocal() as db:
+        visit_types = [VisitType(name=f"Type {i}") for i in range(3)]
+        destinations = [
+            Destination(name=f"Place {i}", location=f"Floor {i}")
+            for i in range(4)
+        ]
+        db.add_all(visit_types + destinations)
+        db.flush()
+        start = datetime(2025, 1, 1, 8)
+        db.add_all(
+            Visit(
+                visitor=f"Visitor {i}",
+                visit_type_id=visit_types[i % 3].id,
+                destination_id=destinations[i % 4].id,
+                entry_time=start + timedelta(minutes=i),
+            )
+            for i in range(VISITS)
+        )
+        db.commit()
+    yield
+    Base.metadata.drop_all(bind=write_db.engine)
+
+
+async def count_statements(*limits: int) -> list:
+    """
+    SQL statements issued to list and serialize a page of each size.
+    """
+    statements = 0
+
+    def before_cursor_execute(*args):
+        nonlocal statements
+        statements += 1
+
+    sync_engine = write_db.async_engine.sync_engine
+    counts = []
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        for limit in limits:
+            statements = 0
+            async with AsyncSessionLocal() as db:
+                visits = await VisitRepository(db).get_all(limit=limit)
+                assert len(visits) == limit
+                [VisitOut.model_validate(visit) for visit in visits]
+            counts.append(statements)
+    finally:
+        event.remove(
+            sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+        await write_db.dispose()
+    return counts
+
+
+def test_listing_visits_does_not_query_per_row():
+    one, many = asyncio.run(count_statements(1, VISITS))
+    assert one == many
@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta, timezone
+
+from app.features.visits.filters import CONTAINS, VisitFilters
+
+
+def visit_filters(**values) -> VisitFilters:
+    params = dict.fromkeys(
+        (
+            "visitor",
+            "destination_id",
+            "visit_type_id",
+            "entry_from",
+            "entry_to",
+            "exit_from",
+            "exit_to",
+        )
+    )
+    return VisitFilters(**{**params, "visitor_match": CONTAINS, **values})
+
+
+def test_time_ranges_are_compared_as_naive_utc():
+    filters = visit_filters(
+        entry_from=datetime(2025, 1, 1, 10, tzinfo=timezone.utc),
+        exit_to=datetime(2025, 1, 1, 12, tzinfo=timezone(timedelta(hours=2))),
+    )
+    criteria = [
+        criterion.right.value for criterion in filters.sql_criteria()
+    ]
+    assert criteria == [datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 10)]
+    assert filters.mongo_query() == {
+        "entry_time": {"$gte": datetime(2025, 1, 1, 10)},
+        "exit_time": {"$lt": datetime(2025, 1, 1, 10)},
+    }
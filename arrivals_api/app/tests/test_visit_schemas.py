@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from app.features.visits.schemas import VisitCreate, VisitPatch
+
+
+def test_visit_times_are_stored_as_naive_utc():
+    visit = VisitCreate(
+        visitor="Ana",
+        visit_type_id=1,
+        destination_id=1,
+        entry_time="2025-01-01T10:00:00Z",
+        exit_time="2025-01-01T12:30:00+02:00",
+    )
+    assert visit.entry_time == datetime(2025, 1, 1, 10)
+    assert visit.exit_time == datetime(2025, 1, 1, 10, 30)
+
+
+def test_naive_visit_times_are_kept():
+    patch = VisitPatch(id=1, entry_time="2025-01-01T10:00:00", exit_time=None)
+    assert patch.entry_time == datetime(2025, 1, 1, 10)
+    assert patch.model_dump(exclude_unset=True)["exit_time"] is None
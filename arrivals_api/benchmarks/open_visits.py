@@ -0,0 +1,123 @@
+"""
+Time the "currently on site" query (``VisitRepository.get_open``) against a
+large history of closed visits.
+
+    python -m benchmarks.open_visits --visits 1000000 --open 300
+
+Prints the query plan and latency percentiles with and without a
+destination filter.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select, text
+
+from app.core.write_db import AsyncSessionLocal, SessionLocal, write_db
+from app.features.visits.models import Destination, Visit, VisitType
+from app.features.visits.write_repo import VisitRepository
+from app.main import app
+
+BATCH_SIZE = 50_000
+
+
+def load_history(visits: int, open_visits: int) -> int:
+    """
+    Insert ``visits`` rows straight into the write DB, ``open_visits`` of
+    them still on site. Returns the number of destinations.
+    """
+    rng = random.Random(1)
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        db.execute(
+            insert(VisitType), [{"name": f"Type {i}"} for i in range(5)]
+        )
+        db.execute(
+            insert(Destination),
+            [{"name": f"Dest {i}", "location": "Bench"} for i in range(20)],
+        )
+        type_ids = db.scalars(select(VisitType.id)).all()
+        destination_ids = db.scalars(select(Destination.id)).all()
+
+        open_at = set(rng.sample(range(visits), open_visits))
+        for start in range(0, visits, BATCH_SIZE):
+            rows = []
+            for i in range(start, min(start + BATCH_SIZE, visits)):
+                entry_time = now - timedelta(minutes=rng.randint(1, 525_600))
+                rows.append(
+                    {
+                        "visitor": f"Visitor {i}",
+                        "visit_type_id": rng.choice(type_ids),
+                        "destination_id": rng.choice(destination_ids),
+                        "entry_time": entry_time,
+                        "exit_time": (
+                            None
+                            if i in open_at
+                            else entry_time + timedelta(hours=2)
+                        ),
+                    }
+                )
+            db.execute(insert(Visit), rows)
+            db.commit()
+        if write_db.engine.dialect.name in ("sqlite", "postgresql"):
+            db.execute(text("ANALYZE"))
+            db.commit()
+        return len(destination_ids)
+
+
+def explain(destination_id) -> str:
+    query = select(Visit.id).where(Visit.exit_time.is_(None))
+    if destination_id is not None:
+        query = query.where(Visit.destination_id == destination_id)
+    query = query.order_by(Visit.entry_time, Visit.id)
+    engine = write_db.engine
+    sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+    prefix = (
+        "EXPLAIN QUERY PLAN "
+        if engine.dialect.name == "sqlite"
+        else "EXPLAIN "
+    )
+    with engine.connect() as connection:
+        rows = connection.execute(text(prefix + sql)).all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+async def time_query(destination_id, runs: int) -> dict:
+    latencies = []
+    async with AsyncSessionLocal() as db:
+        repo = VisitRepository(db)
+        for _ in range(runs):
+            start = time.perf_counter()
+            visits = await repo.get_open(destination_id)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "rows": len(visits),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with app.router.lifespan_context(app):
+        start = time.perf_counter()
+        load_history(args.visits, args.open)
+        elapsed = time.perf_counter() - start
+        print(f"Loaded {args.visits} visits in {elapsed:.1f}s")
+
+        for destination_id in (None, 1):
+            print(f"\ndestination_id={destination_id}")
+            print(explain(destination_id))
+            print(await time_query(destination_id, args.runs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--visits", type=int, default=1_000_000)
+    parser.add_argument("--open", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,65 @@
+"""
+Check that listing visits issues a constant number of SQL statements no
+matter how many rows are serialized (no 1 + 2N lazy loads).
+
+    python -m benchmarks.query_count --visits 2000
+
+Exits non-zero when the statement count grows with the page size.
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Dict
+
+from sqlalchemy import event
+
+from app.core.write_db import AsyncSessionLocal, SessionLocal, write_db
+from app.features.visits.schemas import VisitOut
+from app.features.visits.seed import build_seeder
+from app.features.visits.write_repo import VisitRepository
+from app.main import app
+
+PAGE_SIZES = (10, 100, 1000)
+
+
+async def count_statements(limit: int) -> int:
+    statements = 0
+
+    def before_cursor_execute(*args):
+        nonlocal statements
+        statements += 1
+
+    sync_engine = write_db.async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        async with AsyncSessionLocal() as db:
+            visits = await VisitRepository(db).get_all(limit=limit)
+            [VisitOut.model_validate(visit) for visit in visits]
+    finally:
+        event.remove(
+            sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+    return statements
+
+
+async def main(args: argparse.Namespace) -> int:
+    async with app.router.lifespan_context(app):
+        db = SessionLocal()
+        try:
+            build_seeder(db, batch_size=5000, seed=1).run(args.visits)
+        finally:
+            db.close()
+
+        counts: Dict[int, int] = {}
+        for limit in PAGE_SIZES:
+            counts[limit] = await count_statements(limit)
+            print(f"{limit} visits -> {counts[limit]} statements")
+
+    return 0 if len(set(counts.values())) == 1 else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--visits", type=int, default=max(PAGE_SIZES))
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,129 @@
+"""
+Compare the ways a page of read-model visits can be turned into a JSON
+response body.
+
+    python -m benchmarks.read_serialization --documents 10000
+
+``models`` is the original path: full documents, one ``VisitOut`` per
+document, then FastAPI's ``response_model`` pass (validate again, encode,
+``json.dumps``). ``bulk`` fetches projected documents and validates them
+with a single ``TypeAdapter`` call. ``raw`` encodes the projected
+documents with orjson and skips validation altogether. Each path is timed
+with and without the read DB fetch.
+
+Without ``READ_DB_URL`` in the environment it runs on mongomock.
+"""
+
+import os
+
+os.environ.setdefault("READ_DB_URL", "mongomock://localhost")
+os.environ.setdefault("READ_DB_NAME", "arrivals_bench")
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime, timedelta  # noqa: E402
+from typing import Callable, List  # noqa: E402
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.core.serialization import dump_json  # noqa: E402
+from app.features.visits.projections import (  # noqa: E402
+    destination_document,
+    visit_document,
+    visit_type_document,
+)
+from app.features.visits.read_repo import VisitRepository  # noqa: E402
+from app.features.visits.schemas import VisitOut  # noqa: E402
+
+VISITS = TypeAdapter(List[VisitOut])
+
+
+def load_documents(repo: VisitRepository, documents: int) -> None:
+    visit_types = [visit_type_document(i, f"Type {i}") for i in range(1, 8)]
+    destinations = [
+        destination_document(i, f"Destination {i}", f"Building {i % 3}")
+        for i in range(1, 11)
+    ]
+    start = datetime(2026, 1, 1, 8)
+    repo.collection.delete_many({})
+    repo.collection.insert_many(
+        visit_document(
+            i,
+            f"Visitor {i}",
+            visit_types[i % len(visit_types)],
+            destinations[i % len(destinations)],
+            start + timedelta(minutes=i),
+            start + timedelta(minutes=i + 90) if i % 4 else None,
+        )
+        for i in range(1, documents + 1)
+    )
+
+
+def models_body(documents: List[dict]) -> bytes:
+    visits = [VisitOut(**document) for document in documents]
+    # What FastAPI does with the returned models for response_model
+    content = jsonable_encoder(
+        VISITS.dump_python(VISITS.validate_python(visits), mode="json")
+    )
+    return json.dumps(content, ensure_ascii=False).encode()
+
+
+def bulk_body(documents: List[dict]) -> bytes:
+    return VISITS.dump_json(VISITS.validate_python(documents))
+
+
+def raw_body(documents: List[dict]) -> bytes:
+    return dump_json(documents)
+
+
+def timed(func: Callable[[], bytes], repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "min_ms": round(min(timings) * 1000, 2),
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    repo = VisitRepository()
+    load_documents(repo, args.documents)
+
+    full = list(repo.collection.find({}).sort("_id", 1))
+    projected = repo.get_all_raw()
+    paths = {
+        "models": (
+            lambda: list(repo.collection.find({}).sort("_id", 1)),
+            models_body,
+            full,
+        ),
+        "bulk": (repo.get_all_raw, bulk_body, projected),
+        "raw": (repo.get_all_raw, raw_body, projected),
+    }
+    # Every path has to produce the same JSON
+    bodies = {
+        name: json.loads(body(docs)) for name, (_, body, docs) in paths.items()
+    }
+    assert bodies["models"] == bodies["bulk"] == bodies["raw"]
+
+    print(f"{args.documents} documents, {args.repeat} runs each")
+    for name, (fetch, body, documents) in paths.items():
+        encode_only = timed(lambda: body(documents), args.repeat)
+        end_to_end = timed(lambda: body(fetch()), args.repeat)
+        print(
+            f"{name:>6}: encode {encode_only['median_ms']:>8} ms"
+            f" | fetch + encode {end_to_end['median_ms']:>8} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,246 @@
+"""
+Reproducible API benchmark: boots ``app.main:app`` in process, seeds a
+fixed dataset and measures latency percentiles and throughput of the main
+endpoints under concurrent clients. Results are written as JSON so runs can
+be diffed in review.
+
+    python -m benchmarks.suite --size 100k --concurrency 50 \\
+        --output benchmarks/results/100k.json
+
+Without ``WRITE_DB_URL`` / ``READ_DB_URL`` in the environment it runs on a
+temporary SQLite file and mongomock, so nothing has to be installed or
+started. With mongomock every projected write scans the whole collection,
+so the projector is paused while measuring unless ``--projector`` is given.
+"""
+
+import os
+import tempfile
+
+# Local stand-ins, only used for settings that are not already set
+LOCAL_ENV = {
+    "WRITE_DB_URL": "sqlite:///"
+    + os.path.join(tempfile.gettempdir(), "arrivals_bench.db"),
+    "READ_DB_URL": "mongomock://localhost",
+    "READ_DB_NAME": "arrivals_bench",
+    "INITIAL_ADMIN_USERNAME": "admin",
+    "INITIAL_ADMIN_PASSWORD": "admin",
+    "SECRET_KEY": "benchmark-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+}
+for _name, _value in LOCAL_ENV.items():
+    os.environ.setdefault(_name, _value)
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import random  # noqa: E402
+import subprocess  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime, timezone  # noqa: E402
+from typing import Callable, Dict, List, Optional  # noqa: E402
+
+import httpx  # noqa: E402
+import sqlalchemy  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.projector import projector  # noqa: E402
+from app.core.read_db import MONGOMOCK_SCHEME  # noqa: E402
+from app.core.write_db import SessionLocal, write_db  # noqa: E402
+from app.features.visits.seed import (  # noqa: E402
+    build_seeder,
+    project_outbox,
+)
+from app.main import app  # noqa: E402
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+SCENARIOS = ("login", "create_visit", "get_visit", "list_visits", "report")
+BENCH_USER = {
+    "username": "bench",
+    "email": "bench@example.com",
+    "password": "bench-password",
+    "full_name": "Benchmark User",
+}
+
+# Builds one request (method, path, json body) from the request number
+RequestFactory = Callable[[int], tuple]
+
+
+def percentile(latencies: List[float], share: float) -> float:
+    index = max(int(round(len(latencies) * share)) - 1, 0)
+    return round(latencies[index] * 1000, 2)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    build_request: RequestFactory,
+    requests: int,
+    concurrency: int,
+) -> dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            method, path, body = build_request(i)
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                key = str(response.status_code)
+                errors[key] = errors.get(key, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+        "p50_ms": percentile(latencies, 0.50),
+        "p90_ms": percentile(latencies, 0.90),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+def request_factories(visits: int, seed: int) -> Dict[str, RequestFactory]:
+    # One generator per scenario so adding one does not shift the others
+    visit_ids = random.Random(seed)
+    page_starts = random.Random(seed + 1)
+    login = {
+        "username": BENCH_USER["username"],
+        "password": BENCH_USER["password"],
+    }
+
+    def create_visit(i: int) -> tuple:
+        body = {
+            "visitor": f"Bench Visitor {i}",
+            "visit_type_id": i % 7 + 1,
+            "destination_id": i % 10 + 1,
+            "entry_time": "2026-01-01T08:00:00",
+        }
+        return "POST", "/visits/", body
+
+    return {
+        "login": lambda i: ("POST", "/login", login),
+        "create_visit": create_visit,
+        "get_visit": lambda i: (
+            "GET",
+            f"/visits/{visit_ids.randint(1, visits)}",
+            None,
+        ),
+        "list_visits": lambda i: (
+            "GET",
+            f"/visits/?after_id={page_starts.randint(0, visits)}&limit=100",
+            None,
+        ),
+        "report": lambda i: ("GET", "/reports/visits", None),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    visits = SIZES[args.size]
+    mongomock = settings.read_db_url.startswith(MONGOMOCK_SCHEME)
+    keep_projector = args.projector or not mongomock
+
+    async with app.router.lifespan_context(app):
+        with SessionLocal() as db:
+            seed_report = build_seeder(
+                db, batch_size=5000, seed=args.seed
+            ).run(visits)
+        # The read model is complete before anything is measured
+        project_outbox(5000)
+        if not keep_projector:
+            await projector.stop()
+
+        # Failed requests are counted by status code instead of aborting
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            response = await client.post("/users/", json=BENCH_USER)
+            response.raise_for_status()
+
+            factories = request_factories(visits, args.seed)
+            scenarios = {}
+            for name in args.scenarios:
+                # bcrypt makes each login cost a few hundred milliseconds
+                requests = (
+                    args.login_requests if name == "login" else args.requests
+                )
+                scenarios[name] = await run_scenario(
+                    client, factories[name], requests, args.concurrency
+                )
+                print(name, json.dumps(scenarios[name]))
+
+        if not keep_projector:
+            projector.start()
+
+    return {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "write_db": write_db.engine.dialect.name,
+            "read_db": "mongomock" if mongomock else "mongodb",
+            "projector": keep_projector,
+        },
+        "params": {
+            "size": args.size,
+            "visits": visits,
+            "seed": args.seed,
+            "requests": args.requests,
+            "login_requests": args.login_requests,
+            "concurrency": args.concurrency,
+        },
+        "seed": seed_report.model_dump(),
+        "scenarios": scenarios,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", choices=SIZES, default="10k")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--login-requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--projector",
+        action="store_true",
+        help="Keep projecting writes while measuring, even on mongomock.",
+    )
+    parser.add_argument("--output", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Results written to {args.output}")
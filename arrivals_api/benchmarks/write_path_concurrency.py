@@ -0,0 +1,106 @@
+"""
+Compare request throughput of the blocking write path (sync ``Session``
+called from ``async def`` handlers) against the ``AsyncSession`` path under
+concurrent clients.
+
+    python -m benchmarks.write_path_concurrency --concurrency 50
+
+The database is taken from ``WRITE_DB_URL``. Run it against PostgreSQL:
+there each blocking round trip stalls the event loop for the network wait,
+while an in-process SQLite file has no wait to overlap and mostly measures
+the aiosqlite thread hop.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+from fastapi import HTTPException
+
+from app.core.write_base_repository import BaseRepository
+from app.core.write_db import SessionLocal
+from app.features.visits.models import Visit
+from app.features.visits.schemas import VisitOut
+from app.features.visits.seed import build_seeder
+from app.features.visits.write_repo import VISIT_LOADER_OPTIONS
+from app.main import app
+
+BLOCKING_PATH = "/_bench/blocking-visits/{}"
+ASYNC_PATH = "/visits/{}"
+
+
+@app.get(BLOCKING_PATH.format("{visit_id}"), response_model=VisitOut)
+async def get_visit_blocking(visit_id: int):
+    # The pre-AsyncSession handler shape: sync repository in an async def.
+    # The session is closed before returning; holding it until the response
+    # is sent can exhaust the pool while the loop is blocked on a checkout.
+    with SessionLocal() as db:
+        repo = BaseRepository(Visit, db, loader_options=VISIT_LOADER_OPTIONS)
+        visit = repo.get(visit_id)
+        if not visit:
+            raise HTTPException(status_code=404, detail="Visit not found")
+        return VisitOut.model_validate(visit)
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    path: str,
+    requests: int,
+    concurrency: int,
+    max_id: int,
+) -> dict:
+    latencies: List[float] = []
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            response = await client.get(path.format(i % max_id + 1))
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with app.router.lifespan_context(app):
+        db = SessionLocal()
+        try:
+            build_seeder(db, batch_size=5000, seed=1).run(args.visits)
+        finally:
+            db.close()
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for name, path in (
+                ("blocking", BLOCKING_PATH),
+                ("async", ASYNC_PATH),
+            ):
+                result = await run_load(
+                    client, path, args.requests, args.concurrency, args.visits
+                )
+                print(name, result)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--visits", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))